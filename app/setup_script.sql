@@ -204,6 +204,18 @@ CREATE TABLE IF NOT EXISTS data_schema.tag_rule_kpi_results (
 );
 
 
+-- Create view joining applied rules with their rule definitions
+CREATE OR REPLACE VIEW data_schema.v_applied_rules_enriched AS
+SELECT 
+    ar.applied_rule_id, ar.rule_id, cr.rule_name, ar.threshold_value,
+    cr.rule_type, cr.check_parameter, cr.comparison_operator, cr.unit,
+    ar.scope, ar.tag_name, ar.tag_value,
+    ar.applied_at, ar.applied_by, ar.is_active,
+    cr.has_fix_button, cr.has_fix_sql
+FROM data_schema.applied_rules ar
+JOIN data_schema.config_rules cr ON ar.rule_id = cr.rule_id;
+
+
 -- Insert predefined configuration rules for warehouses
 INSERT INTO data_schema.config_rules (rule_id, rule_name, rule_description, rule_type, check_parameter, comparison_operator, unit, default_threshold, allow_threshold_override, has_fix_button, has_fix_sql)
 SELECT 'MAX_STATEMENT_TIMEOUT', 'Max Statement Timeout in Seconds', 'Maximum allowed statement timeout for warehouses', 'Warehouse', 'STATEMENT_TIMEOUT_IN_SECONDS', 'MAX', 'seconds', 300, TRUE, TRUE, TRUE
@@ -478,4 +490,5 @@ GRANT ALL ON TABLE data_schema.warehouse_compliance_results TO APPLICATION ROLE
 GRANT ALL ON TABLE data_schema.database_compliance_results TO APPLICATION ROLE config_rules_admin;
 GRANT ALL ON TABLE data_schema.tag_compliance_results TO APPLICATION ROLE config_rules_admin;
 GRANT ALL ON TABLE data_schema.rule_kpi_results TO APPLICATION ROLE config_rules_admin;
-GRANT ALL ON TABLE data_schema.tag_rule_kpi_results TO APPLICATION ROLE config_rules_admin;
\ No newline at end of file
+GRANT ALL ON TABLE data_schema.tag_rule_kpi_results TO APPLICATION ROLE config_rules_admin;
+GRANT SELECT ON VIEW data_schema.v_applied_rules_enriched TO APPLICATION ROLE config_rules_admin;
\ No newline at end of file
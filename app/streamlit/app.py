@@ -16,8 +16,18 @@ from tab_database_compliance import render_database_compliance_tab
 from tab_details import render_details_tab
 from tab_whitelist import render_whitelist_tab
 
+
+@st.cache_resource(show_spinner=False)
+def get_session():
+    """Return the active Snowflake session, resolved once and reused across reruns
+    
+    The session is owned by the Snowflake runtime, so no on_release/close() hook is registered here.
+    """
+    return get_active_session()
+
+
 # Get the active Snowflake session
-session = get_active_session()
+session = get_session()
 
 # Set page configuration
 st.set_page_config(
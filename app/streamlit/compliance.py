@@ -3,6 +3,7 @@ Compliance checking module
 Handles warehouse compliance validation against applied rules
 """
 
+import collections
 import pandas as pd
 
 
@@ -10,7 +11,7 @@ def check_rule_applies_to_object(rule, object_tags):
     """Check if a rule applies to an object based on scope and tags
     
     Args:
-        rule: Rule row from applied_rules with SCOPE, TAG_NAME, TAG_VALUE
+        rule: Rule record (dict) from applied_rules with SCOPE, TAG_NAME, TAG_VALUE
         object_tags: Dict of {tag_name: tag_value} for the object (tag names should be uppercase)
     
     Returns:
@@ -48,6 +49,59 @@ def check_rule_applies_to_object(rule, object_tags):
     return False
 
 
+def _whitelist_keys(whitelist_df, columns):
+    """Build a set of whitelist key tuples for O(1) violation lookups
+    
+    Args:
+        whitelist_df: DataFrame with whitelisted violations (may be None or empty)
+        columns: Whitelist columns that make up the key, in lookup order
+    
+    Returns:
+        set: Tuples of the given column values, one per whitelist row
+    """
+    if whitelist_df is None or whitelist_df.empty:
+        return set()
+    return set(zip(*(whitelist_df[col] for col in columns)))
+
+
+def _normalized_tags(tag_rows):
+    """Build an object's {TAG_NAME: tag_value} dict from its tag assignment records
+    
+    Args:
+        tag_rows: Iterable of tag assignment dicts with TAG_NAME and TAG_VALUE
+    
+    Returns:
+        dict: Simple uppercase tag names mapped to values; rows missing either are skipped
+    """
+    object_tags = {}
+    for tag_row in tag_rows:
+        if pd.notna(tag_row.get('TAG_NAME')) and pd.notna(tag_row.get('TAG_VALUE')):
+            # Normalize tag name: extract simple name and uppercase
+            tag_full_name = tag_row['TAG_NAME']
+            tag_parts = str(tag_full_name).split('.')
+            tag_name_simple = tag_parts[-1] if tag_parts else tag_full_name
+            object_tags[tag_name_simple.upper()] = tag_row['TAG_VALUE']
+    return object_tags
+
+
+def _tags_by_object(tag_df):
+    """Index tag assignments by (OBJECT_TYPE, OBJECT_NAME) in one pass
+    
+    Args:
+        tag_df: DataFrame with tag compliance details (may be None or empty)
+    
+    Returns:
+        dict: {(object_type, object_name): normalized tag dict} for every object with tag rows
+    """
+    if tag_df is None or tag_df.empty:
+        return {}
+    
+    rows_by_object = collections.defaultdict(list)
+    for tag_row in tag_df.to_dict('records'):
+        rows_by_object[(tag_row['OBJECT_TYPE'], tag_row['OBJECT_NAME'])].append(tag_row)
+    return {key: _normalized_tags(rows) for key, rows in rows_by_object.items()}
+
+
 def check_wh_compliance(warehouse_df, applied_rules_df, tag_df, whitelist_df):
     """Check warehouse compliance against applied rules
     
@@ -59,26 +113,18 @@ def check_wh_compliance(warehouse_df, applied_rules_df, tag_df, whitelist_df):
     """
     compliance_data = []
     
-    # Filter for warehouse rules only
-    wh_rules = applied_rules_df[applied_rules_df['RULE_TYPE'] == 'Warehouse']
+    # Filter for warehouse rules only, as plain dicts built once for every warehouse
+    wh_rules = applied_rules_df[applied_rules_df['RULE_TYPE'] == 'Warehouse'].to_dict('records')
     
-    for _, wh in warehouse_df.iterrows():
+    # Index tags and whitelist entries once instead of masking the frames per warehouse
+    tags_by_object = _tags_by_object(tag_df)
+    whitelisted_keys = _whitelist_keys(whitelist_df, ['RULE_ID', 'OBJECT_NAME', 'OBJECT_TYPE'])
+    
+    for wh in warehouse_df.to_dict('records'):
         wh_name = wh['NAME']
         
         # Get tags for this warehouse
-        wh_tags = {}
-        if tag_df is not None and not tag_df.empty:
-            wh_tag_rows = tag_df[
-                (tag_df['OBJECT_TYPE'] == 'WAREHOUSE') & 
-                (tag_df['OBJECT_NAME'] == wh_name)
-            ]
-            for _, tag_row in wh_tag_rows.iterrows():
-                if pd.notna(tag_row.get('TAG_NAME')) and pd.notna(tag_row.get('TAG_VALUE')):
-                    # Normalize tag name: extract simple name and uppercase
-                    tag_full_name = tag_row['TAG_NAME']
-                    tag_parts = str(tag_full_name).split('.')
-                    tag_name_simple = tag_parts[-1] if tag_parts else tag_full_name
-                    wh_tags[tag_name_simple.upper()] = tag_row['TAG_VALUE']
+        wh_tags = tags_by_object.get(('WAREHOUSE', wh_name), {})
         
         wh_compliance = {
             'warehouse_name': wh_name,
@@ -90,7 +136,7 @@ def check_wh_compliance(warehouse_df, applied_rules_df, tag_df, whitelist_df):
             'applicable_rules': []
         }
         
-        for _, rule in wh_rules.iterrows():
+        for rule in wh_rules:
             # Check if this rule applies to this warehouse based on scope and tags
             if not check_rule_applies_to_object(rule, wh_tags):
                 continue
@@ -131,14 +177,7 @@ def check_wh_compliance(warehouse_df, applied_rules_df, tag_df, whitelist_df):
             
             if not is_compliant:
                 # Check if this violation is whitelisted
-                is_whitelisted = False
-                if whitelist_df is not None and not whitelist_df.empty:
-                    whitelisted = whitelist_df[
-                        (whitelist_df['RULE_ID'] == rule['RULE_ID']) &
-                        (whitelist_df['OBJECT_NAME'] == wh_name) &
-                        (whitelist_df['OBJECT_TYPE'] == 'WAREHOUSE')
-                    ]
-                    is_whitelisted = not whitelisted.empty
+                is_whitelisted = (rule['RULE_ID'], wh_name, 'WAREHOUSE') in whitelisted_keys
                 
                 # Add violation with whitelisted flag
                 wh_compliance['violations'].append({
@@ -196,10 +235,14 @@ def check_table_compliance(table_df, applied_rules_df, tag_df, whitelist_df):
     """
     compliance_data = []
     
-    # Filter for database rules only
-    db_rules = applied_rules_df[applied_rules_df['RULE_TYPE'] == 'Database']
+    # Filter for database rules only, as plain dicts built once for every object
+    db_rules = applied_rules_df[applied_rules_df['RULE_TYPE'] == 'Database'].to_dict('records')
+    
+    # Index tags and whitelist entries once instead of masking the frames per object
+    tags_by_object = _tags_by_object(tag_df)
+    whitelisted_keys = _whitelist_keys(whitelist_df, ['RULE_ID', 'OBJECT_NAME', 'OBJECT_TYPE'])
     
-    for _, obj in table_df.iterrows():
+    for obj in table_df.to_dict('records'):
         object_type = obj['OBJECT_TYPE']
         db_name = obj['DATABASE_NAME']
         schema_name = obj.get('SCHEMA_NAME')
@@ -216,30 +259,18 @@ def check_table_compliance(table_df, applied_rules_df, tag_df, whitelist_df):
             obj_identifier = db_name
         
         # Get tags for this object
-        obj_tags = {}
-        if tag_df is not None and not tag_df.empty:
-            obj_tag_rows = tag_df[
-                (tag_df['OBJECT_TYPE'] == object_type) & 
-                (tag_df['OBJECT_NAME'] == obj_identifier)
-            ]
+        obj_tags = tags_by_object.get((object_type, obj_identifier), {})
+        if (object_type, obj_identifier) not in tags_by_object and object_type == 'TABLE' and tag_df is not None and not tag_df.empty:
             # Also try matching by individual components for tables if columns exist
             # Note: whitelist table uses DATABASE_NAME, SCHEMA_NAME, TABLE_NAME
-            if obj_tag_rows.empty and object_type == 'TABLE':
-                if all(col in tag_df.columns for col in ['DATABASE_NAME', 'SCHEMA_NAME', 'TABLE_NAME']):
-                    obj_tag_rows = tag_df[
-                        (tag_df['OBJECT_TYPE'] == 'TABLE') &
-                        (tag_df['DATABASE_NAME'] == db_name) &
-                        (tag_df['SCHEMA_NAME'] == schema_name) &
-                        (tag_df['TABLE_NAME'] == table_name)
-                    ]
-            
-            for _, tag_row in obj_tag_rows.iterrows():
-                if pd.notna(tag_row.get('TAG_NAME')) and pd.notna(tag_row.get('TAG_VALUE')):
-                    # Normalize tag name: extract simple name and uppercase
-                    tag_full_name = tag_row['TAG_NAME']
-                    tag_parts = str(tag_full_name).split('.')
-                    tag_name_simple = tag_parts[-1] if tag_parts else tag_full_name
-                    obj_tags[tag_name_simple.upper()] = tag_row['TAG_VALUE']
+            if all(col in tag_df.columns for col in ['DATABASE_NAME', 'SCHEMA_NAME', 'TABLE_NAME']):
+                obj_tag_rows = tag_df[
+                    (tag_df['OBJECT_TYPE'] == 'TABLE') &
+                    (tag_df['DATABASE_NAME'] == db_name) &
+                    (tag_df['SCHEMA_NAME'] == schema_name) &
+                    (tag_df['TABLE_NAME'] == table_name)
+                ]
+                obj_tags = _normalized_tags(obj_tag_rows.to_dict('records'))
         
         obj_compliance = {
             'object_type': object_type,
@@ -253,7 +284,7 @@ def check_table_compliance(table_df, applied_rules_df, tag_df, whitelist_df):
             'applicable_rules': []
         }
         
-        for _, rule in db_rules.iterrows():
+        for rule in db_rules:
             rule_id = rule['RULE_ID']
             
             # Match rules to object types
@@ -302,14 +333,7 @@ def check_table_compliance(table_df, applied_rules_df, tag_df, whitelist_df):
             
             if not is_compliant:
                 # Check if this violation is whitelisted
-                is_whitelisted = False
-                if whitelist_df is not None and not whitelist_df.empty:
-                    whitelisted = whitelist_df[
-                        (whitelist_df['RULE_ID'] == rule['RULE_ID']) &
-                        (whitelist_df['OBJECT_NAME'] == obj_identifier) &
-                        (whitelist_df['OBJECT_TYPE'] == object_type)
-                    ]
-                    is_whitelisted = not whitelisted.empty
+                is_whitelisted = (rule['RULE_ID'], obj_identifier, object_type) in whitelisted_keys
                 
                 # Add violation with whitelisted flag
                 obj_compliance['violations'].append({
@@ -377,7 +401,44 @@ def check_tag_compliance(all_objects_df, tag_assignments_df, applied_tag_rules_d
     """
     compliance_data = []
     
-    for _, obj in all_objects_df.iterrows():
+    # Normalize each applied tag rule's required tag once, not once per object
+    required_tags = []
+    for rule in applied_tag_rules_df.to_dict('records'):
+        required_tag_full = rule['TAG_NAME']
+        # Extract just the tag name from the fully qualified tag name and normalize
+        required_tag_parts = str(required_tag_full).split('.')
+        required_tag = required_tag_parts[-1] if required_tag_parts else required_tag_full
+        required_tags.append((rule, required_tag_full, required_tag.upper()))
+    
+    whitelisted_keys = _whitelist_keys(whitelist_df, ['OBJECT_NAME', 'OBJECT_TYPE', 'RULE_ID', 'TAG_NAME'])
+    default_object_type = applied_tag_rules_df.iloc[0]['OBJECT_TYPE'] if not applied_tag_rules_df.empty else 'UNKNOWN'
+    
+    # Uppercase the match columns once and index each assignment's normalized tag name by
+    # (name), (name, database) and (name, database, schema), instead of re-scanning the
+    # whole tag frame for every object
+    has_database = 'OBJECT_DATABASE' in tag_assignments_df.columns
+    has_schema = has_database and 'OBJECT_SCHEMA' in tag_assignments_df.columns
+    names_upper = tag_assignments_df['OBJECT_NAME'].str.upper()
+    databases_upper = tag_assignments_df['OBJECT_DATABASE'].str.upper() if has_database else [None] * len(tag_assignments_df)
+    schemas_upper = tag_assignments_df['OBJECT_SCHEMA'].str.upper() if has_schema else [None] * len(tag_assignments_df)
+    
+    tags_by_name = collections.defaultdict(list)
+    tags_by_database = collections.defaultdict(list)
+    tags_by_table = collections.defaultdict(list)
+    for tag_full_name, name, database, schema in zip(tag_assignments_df['TAG_NAME'], names_upper, databases_upper, schemas_upper):
+        if pd.isna(tag_full_name) or pd.isna(name):
+            continue
+        # Extract just the tag name from fully qualified name (DATABASE.SCHEMA.TAG_NAME), uppercased
+        tag_parts = str(tag_full_name).split('.')
+        tag_name_only = (tag_parts[-1] if tag_parts else tag_full_name).upper()
+        
+        tags_by_name[name].append(tag_name_only)
+        if has_database and pd.notna(database):
+            tags_by_database[(name, database)].append(tag_name_only)
+            if has_schema and pd.notna(schema):
+                tags_by_table[(name, database, schema)].append(tag_name_only)
+    
+    for obj in all_objects_df.to_dict('records'):
         object_name = obj['OBJECT_NAME']
         object_database = obj.get('OBJECT_DATABASE')
         object_schema = obj.get('OBJECT_SCHEMA')
@@ -391,50 +452,28 @@ def check_tag_compliance(all_objects_df, tag_assignments_df, applied_tag_rules_d
             full_object_name = object_name
         
         # Get all tags assigned to this specific object
-        # Different matching strategy based on object type
-        # Use case-insensitive comparison by converting to uppercase
+        # Different matching strategy based on object type, case-insensitive
+        name_upper = str(object_name).upper()
         if pd.notna(object_schema):
             # For tables: match on database, schema, and table name
-            if 'OBJECT_DATABASE' in tag_assignments_df.columns and 'OBJECT_SCHEMA' in tag_assignments_df.columns:
-                object_tags_df = tag_assignments_df[
-                    (tag_assignments_df['OBJECT_NAME'].str.upper() == str(object_name).upper()) &
-                    (tag_assignments_df['OBJECT_DATABASE'].str.upper() == str(object_database).upper()) &
-                    (tag_assignments_df['OBJECT_SCHEMA'].str.upper() == str(object_schema).upper())
-                ]
-            else:
-                object_tags_df = pd.DataFrame()
+            object_tags = list(tags_by_table.get(
+                (name_upper, str(object_database).upper(), str(object_schema).upper()), []
+            )) if has_schema else []
         elif pd.notna(object_database):
             # For databases: match on database name
-            if 'OBJECT_DATABASE' in tag_assignments_df.columns:
-                object_tags_df = tag_assignments_df[
-                    (tag_assignments_df['OBJECT_NAME'].str.upper() == str(object_name).upper()) &
-                    (tag_assignments_df['OBJECT_DATABASE'].str.upper() == str(object_database).upper())
-                ]
-            else:
-                object_tags_df = pd.DataFrame()
+            object_tags = list(tags_by_database.get(
+                (name_upper, str(object_database).upper()), []
+            )) if has_database else []
         else:
-            # For warehouses: match by object name only (case-insensitive)
-            object_tags_df = tag_assignments_df[
-                tag_assignments_df['OBJECT_NAME'].str.upper() == str(object_name).upper()
-            ]
-        
-        # Extract just the tag names (not the full qualified name) and normalize them
-        object_tags = []
-        for _, tag_row in object_tags_df.iterrows():
-            tag_full_name = tag_row['TAG_NAME']
-            # Extract just the tag name from fully qualified name (DATABASE.SCHEMA.TAG_NAME)
-            if pd.notna(tag_full_name):
-                # Get the last part after the last dot (the actual tag name)
-                tag_parts = str(tag_full_name).split('.')
-                tag_name_only = tag_parts[-1] if tag_parts else tag_full_name
-                # Normalize to uppercase for consistent comparison
-                object_tags.append(tag_name_only.upper())
+            # For warehouses: match by object name only
+            object_tags = list(tags_by_name.get(name_upper, []))
+        object_tag_set = set(object_tags)
         
         obj_compliance = {
             'object_name': full_object_name,
             'object_database': object_database,
             'object_schema': object_schema,
-            'object_type': obj.get('OBJECT_TYPE', applied_tag_rules_df.iloc[0]['OBJECT_TYPE'] if not applied_tag_rules_df.empty else 'UNKNOWN'),
+            'object_type': obj.get('OBJECT_TYPE', default_object_type),
             'table_type': obj.get('TABLE_TYPE'),
             'owner': obj.get('OWNER'),
             'assigned_tags': object_tags,
@@ -442,27 +481,12 @@ def check_tag_compliance(all_objects_df, tag_assignments_df, applied_tag_rules_d
         }
         
         # Check each applied tag rule
-        for _, rule in applied_tag_rules_df.iterrows():
-            required_tag_full = rule['TAG_NAME']
-            
-            # Extract just the tag name from the fully qualified tag name and normalize
-            required_tag_parts = str(required_tag_full).split('.')
-            required_tag = required_tag_parts[-1] if required_tag_parts else required_tag_full
-            required_tag_normalized = required_tag.upper()
-            
+        for rule, required_tag_full, required_tag_normalized in required_tags:
             # Check if the required tag is missing (compare normalized versions)
-            if required_tag_normalized not in object_tags:
+            if required_tag_normalized not in object_tag_set:
                 # Check if this violation is whitelisted
-                is_whitelisted = False
-                if whitelist_df is not None and not whitelist_df.empty:
-                    # For tag violations, we need to match on object, tag, and rule
-                    whitelisted = whitelist_df[
-                        (whitelist_df['OBJECT_NAME'] == full_object_name) &
-                        (whitelist_df['OBJECT_TYPE'] == rule['OBJECT_TYPE']) &
-                        (whitelist_df['RULE_ID'] == 'MISSING_TAG_VALUE') &
-                        (whitelist_df['TAG_NAME'] == required_tag_full)
-                    ]
-                    is_whitelisted = not whitelisted.empty
+                # For tag violations, we need to match on object, tag, and rule
+                is_whitelisted = (full_object_name, rule['OBJECT_TYPE'], 'MISSING_TAG_VALUE', required_tag_full) in whitelisted_keys
                 
                 obj_compliance['violations'].append({
                     'tag_name': required_tag_full,  # Keep full name for display
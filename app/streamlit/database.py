@@ -5,6 +5,7 @@ Handles all Snowflake database queries and operations
 
 import pandas as pd
 import json
+import streamlit as st
 from compliance import check_wh_compliance, check_table_compliance, check_tag_compliance
 
 def parse_json_field(field_value):
@@ -21,6 +22,18 @@ def execute_sql(session, sql):
     """Execute a SQL statement"""
     session.sql(sql).collect()
 
+def get_connection_key(session):
+    """Return an ACCOUNT::WAREHOUSE::ROLE identifier used to scope cached reads to the connection
+    
+    Looked up once per Streamlit session and memoized in st.session_state.
+    """
+    if 'conn_key' not in st.session_state:
+        row = session.sql(
+            "SELECT CURRENT_ACCOUNT() AS account, CURRENT_WAREHOUSE() AS warehouse, CURRENT_ROLE() AS role"
+        ).collect()[0]
+        st.session_state.conn_key = f"{row['ACCOUNT']}::{row['WAREHOUSE']}::{row['ROLE']}"
+    return st.session_state.conn_key
+
 def get_config_rules(session):
     """Retrieve all configuration rules"""
     query = """
@@ -37,14 +50,13 @@ def get_config_rules(session):
 def get_applied_rules(session):
     """Retrieve all applied rules with their threshold values and tag scope"""
     query = """
-    SELECT ar.applied_rule_id, ar.rule_id, cr.rule_name, ar.threshold_value,
-           cr.rule_type, cr.check_parameter, cr.comparison_operator, cr.unit,
-           ar.scope, ar.tag_name, ar.tag_value,
-           ar.applied_at, ar.is_active, cr.has_fix_button, cr.has_fix_sql
-    FROM data_schema.applied_rules ar
-    JOIN data_schema.config_rules cr ON ar.rule_id = cr.rule_id
-    WHERE ar.is_active = TRUE
-    ORDER BY ar.applied_at DESC
+    SELECT applied_rule_id, rule_id, rule_name, threshold_value,
+           rule_type, check_parameter, comparison_operator, unit,
+           scope, tag_name, tag_value,
+           applied_at, is_active, has_fix_button, has_fix_sql
+    FROM data_schema.v_applied_rules_enriched
+    WHERE is_active = TRUE
+    ORDER BY applied_at DESC
     """
     return session.sql(query).to_pandas()
 
@@ -146,6 +158,47 @@ def apply_rule(session, rule_id, threshold_value, scope='ALL', tag_name=None, ta
     execute_sql(session, insert_query)
 
 
+def apply_rules_bulk(session, rules):
+    """Apply several rules with scope ALL using one UPDATE and one multi-row INSERT
+    
+    Args:
+        session: Snowflake session
+        rules: List of (rule_id, threshold_value) tuples
+    
+    Returns:
+        Number of rules applied
+    """
+    if not rules:
+        return 0
+    
+    rule_ids = ", ".join(f"'{rule_id}'" for rule_id, _ in rules)
+    
+    # Deactivate existing active ALL-scope rules for every rule being applied
+    deactivate_query = f"""
+    UPDATE data_schema.applied_rules 
+    SET is_active = FALSE 
+    WHERE rule_id IN ({rule_ids}) 
+      AND scope = 'ALL'
+      AND COALESCE(tag_name, '') = ''
+      AND COALESCE(tag_value, '') = ''
+      AND is_active = TRUE
+    """
+    execute_sql(session, deactivate_query)
+    
+    values = ",\n        ".join(
+        f"('{rule_id}', {threshold_value}, 'ALL', NULL, NULL, CURRENT_USER())"
+        for rule_id, threshold_value in rules
+    )
+    insert_query = f"""
+    INSERT INTO data_schema.applied_rules 
+        (rule_id, threshold_value, scope, tag_name, tag_value, applied_by)
+    VALUES 
+        {values}
+    """
+    execute_sql(session, insert_query)
+    return len(rules)
+
+
 def get_available_tag_names(session):
     """Get list of available tags in the account
     
@@ -1129,7 +1182,8 @@ def get_tag_compliance_results_paginated(session, object_type=None, search_term=
         session: Snowflake session
         object_type: Filter by object type ('WAREHOUSE', 'DATABASE', 'TABLE')
         search_term: Optional object name search filter
-        status_filter: Optional status filter ('compliant', 'non-compliant', 'whitelisted', 'all')
+        status_filter: Optional status filter ('compliant', 'non-compliant', 'whitelisted', 'all',
+            or 'non-compliant-first' to return all objects with non-compliant ones ordered first)
         limit: Number of records to return
         offset: Number of records to skip
     
@@ -1158,7 +1212,6 @@ def get_tag_compliance_results_paginated(session, object_type=None, search_term=
             tcr.owner,
             tcr.assigned_tags,
             tcr.violations,
-            tcr.last_evaluated_at,
             COALESCE(vc.non_whitelisted_count, 0) as non_whitelisted_count,
             COALESCE(vc.whitelisted_count, 0) as whitelisted_count
         FROM data_schema.tag_compliance_results tcr
@@ -1188,6 +1241,11 @@ def get_tag_compliance_results_paginated(session, object_type=None, search_term=
     if where_clauses:
         where_clause = "WHERE " + " AND ".join(where_clauses)
     
+    # Sort before LIMIT/OFFSET so the ordering spans all pages, not just the current one
+    order_by = "object_type, object_name"
+    if status_filter == 'non-compliant-first':
+        order_by = "non_whitelisted_count = 0, " + order_by
+    
     # Get total count
     count_query = f"""
     {base_cte}
@@ -1197,7 +1255,7 @@ def get_tag_compliance_results_paginated(session, object_type=None, search_term=
     """
     total_count = session.sql(count_query).to_pandas().iloc[0]['TOTAL']
     
-    # Get paginated data
+    # Get paginated data; only the columns the tag tab renders are fetched
     query = f"""
     {base_cte}
     SELECT 
@@ -1208,41 +1266,29 @@ def get_tag_compliance_results_paginated(session, object_type=None, search_term=
         table_type,
         owner,
         assigned_tags,
-        violations,
-        last_evaluated_at
+        violations
     FROM parsed_data
     {where_clause}
-    ORDER BY object_type, object_name
+    ORDER BY {order_by}
     LIMIT {limit} OFFSET {offset}
     """
     df = session.sql(query).to_pandas()
     
-    # Convert to list of dictionaries matching the original format
-    compliance_data = []
-    for _, row in df.iterrows():
-        def parse_json_field(field_value):
-            if not field_value:
-                return []
-            if isinstance(field_value, str):
-                return json.loads(field_value)
-            elif isinstance(field_value, list):
-                return field_value
-            else:
-                return []
-        
-        assigned_tags = parse_json_field(row['ASSIGNED_TAGS'])
-        violations = parse_json_field(row['VIOLATIONS'])
-        
-        compliance_data.append({
+    # Convert to list of dictionaries matching the original format, using plain
+    # record dicts rather than building a pandas Series per row with iterrows()
+    compliance_data = [
+        {
             'object_name': row['OBJECT_NAME'],
             'object_database': row['OBJECT_DATABASE'],
             'object_schema': row['OBJECT_SCHEMA'],
             'object_type': row['OBJECT_TYPE'],
             'table_type': row['TABLE_TYPE'],
             'owner': row['OWNER'],
-            'assigned_tags': assigned_tags,
-            'violations': violations
-        })
+            'assigned_tags': parse_json_field(row['ASSIGNED_TAGS']),
+            'violations': parse_json_field(row['VIOLATIONS'])
+        }
+        for row in df.to_dict('records')
+    ]
     
     return compliance_data, total_count
 
@@ -1261,23 +1307,22 @@ def get_wh_compliance_metrics(session, filter_type='all'):
     Returns:
         dict: Metrics including total, violations, compliant, whitelisted counts
     """
+    # Compliance counts and the whitelisted count in one round-trip
     query = """
     SELECT 
         COUNT(*) as total_warehouses,
         SUM(CASE WHEN ARRAY_SIZE(violations) > 0 THEN 1 ELSE 0 END) as warehouses_with_violations,
-        SUM(CASE WHEN ARRAY_SIZE(violations) = 0 THEN 1 ELSE 0 END) as compliant_warehouses
+        SUM(CASE WHEN ARRAY_SIZE(violations) = 0 THEN 1 ELSE 0 END) as compliant_warehouses,
+        (
+            SELECT COUNT(DISTINCT object_name)
+            FROM data_schema.rule_whitelist
+            WHERE object_type = 'WAREHOUSE' AND is_active = TRUE
+        ) as whitelisted_count
     FROM data_schema.warehouse_compliance_results
     """
     result = session.sql(query).to_pandas().iloc[0]
     
-    # Get whitelisted count
-    whitelist_query = """
-    SELECT COUNT(DISTINCT object_name) as whitelisted_count
-    FROM data_schema.rule_whitelist
-    WHERE object_type = 'WAREHOUSE' AND is_active = TRUE
-    """
-    whitelisted = session.sql(whitelist_query).to_pandas().iloc[0]['WHITELISTED_COUNT']
-    
+    whitelisted = result['WHITELISTED_COUNT']
     total = result['TOTAL_WAREHOUSES']
     violations = result['WAREHOUSES_WITH_VIOLATIONS']
     compliant = result['COMPLIANT_WAREHOUSES']
@@ -1304,28 +1349,27 @@ def get_db_compliance_metrics(session, object_type=None, filter_type='all'):
     """
     where_clause = f"WHERE object_type = '{object_type}'" if object_type else ""
     
+    whitelist_where = "object_type IN ('DATABASE', 'SCHEMA', 'TABLE')"
+    if object_type:
+        whitelist_where = f"object_type = '{object_type}'"
+    
+    # Compliance counts and the whitelisted count in one round-trip
     query = f"""
     SELECT 
         COUNT(*) as total_objects,
         SUM(CASE WHEN ARRAY_SIZE(violations) > 0 THEN 1 ELSE 0 END) as objects_with_violations,
-        SUM(CASE WHEN ARRAY_SIZE(violations) = 0 THEN 1 ELSE 0 END) as compliant_objects
+        SUM(CASE WHEN ARRAY_SIZE(violations) = 0 THEN 1 ELSE 0 END) as compliant_objects,
+        (
+            SELECT COUNT(DISTINCT object_name)
+            FROM data_schema.rule_whitelist
+            WHERE {whitelist_where} AND is_active = TRUE
+        ) as whitelisted_count
     FROM data_schema.database_compliance_results
     {where_clause}
     """
     result = session.sql(query).to_pandas().iloc[0]
     
-    # Get whitelisted count
-    whitelist_where = "object_type IN ('DATABASE', 'SCHEMA', 'TABLE')"
-    if object_type:
-        whitelist_where = f"object_type = '{object_type}'"
-    
-    whitelist_query = f"""
-    SELECT COUNT(DISTINCT object_name) as whitelisted_count
-    FROM data_schema.rule_whitelist
-    WHERE {whitelist_where} AND is_active = TRUE
-    """
-    whitelisted = session.sql(whitelist_query).to_pandas().iloc[0]['WHITELISTED_COUNT']
-    
+    whitelisted = result['WHITELISTED_COUNT']
     total = result['TOTAL_OBJECTS']
     violations = result['OBJECTS_WITH_VIOLATIONS']
     compliant = result['COMPLIANT_OBJECTS']
@@ -1352,28 +1396,27 @@ def get_tag_compliance_metrics(session, object_type=None, filter_type='all'):
     """
     where_clause = f"WHERE object_type = '{object_type}'" if object_type else ""
     
+    whitelist_where = "rule_id = 'MISSING_TAG_VALUE'"
+    if object_type:
+        whitelist_where += f" AND object_type = '{object_type}'"
+    
+    # Compliance counts and the tag whitelisted count in one round-trip
     query = f"""
     SELECT 
         COUNT(*) as total_objects,
         SUM(CASE WHEN ARRAY_SIZE(violations) > 0 THEN 1 ELSE 0 END) as objects_with_violations,
-        SUM(CASE WHEN ARRAY_SIZE(violations) = 0 THEN 1 ELSE 0 END) as compliant_objects
+        SUM(CASE WHEN ARRAY_SIZE(violations) = 0 THEN 1 ELSE 0 END) as compliant_objects,
+        (
+            SELECT COUNT(DISTINCT CONCAT(object_name, '|', COALESCE(tag_name, '')))
+            FROM data_schema.rule_whitelist
+            WHERE {whitelist_where} AND is_active = TRUE
+        ) as whitelisted_count
     FROM data_schema.tag_compliance_results
     {where_clause}
     """
     result = session.sql(query).to_pandas().iloc[0]
     
-    # Get whitelisted count for tag compliance
-    whitelist_where = "rule_id = 'MISSING_TAG_VALUE'"
-    if object_type:
-        whitelist_where += f" AND object_type = '{object_type}'"
-    
-    whitelist_query = f"""
-    SELECT COUNT(DISTINCT CONCAT(object_name, '|', COALESCE(tag_name, ''))) as whitelisted_count
-    FROM data_schema.rule_whitelist
-    WHERE {whitelist_where} AND is_active = TRUE
-    """
-    whitelisted = session.sql(whitelist_query).to_pandas().iloc[0]['WHITELISTED_COUNT']
-    
+    whitelisted = result['WHITELISTED_COUNT']
     total = result['TOTAL_OBJECTS']
     violations = result['OBJECTS_WITH_VIOLATIONS']
     compliant = result['COMPLIANT_OBJECTS']
@@ -1429,12 +1472,13 @@ def run_all_compliance_checks(session):
         applied_tag_rules_df = get_applied_tag_rules(session)
         if not applied_tag_rules_df.empty:
             all_tag_compliance = []  # Collect all tag compliance results
-            for object_type in ['WAREHOUSE', 'DATABASE', 'TABLE']:
+            # Only object types that have applied tag rules are fetched; tag assignments
+            # come from the all-types frame loaded above instead of a query per type
+            for object_type, object_tag_rules in applied_tag_rules_df.groupby('OBJECT_TYPE', sort=False):
                 all_objects_df = get_all_objects_by_type(session, object_type)
-                tag_assignments_df = get_tag_compliance_details(session, object_type)
-                object_tag_rules = applied_tag_rules_df[applied_tag_rules_df['OBJECT_TYPE'] == object_type]
+                tag_assignments_df = tag_df[tag_df['OBJECT_TYPE'] == object_type]
                 
-                if not all_objects_df.empty and not object_tag_rules.empty:
+                if not all_objects_df.empty:
                     tag_compliance = check_tag_compliance(all_objects_df, tag_assignments_df, object_tag_rules, whitelist_df)
                     all_tag_compliance.extend(tag_compliance)  # Add to collection
                     summary['tags_evaluated'] += len(tag_compliance)
@@ -1463,6 +1507,9 @@ def run_all_compliance_checks(session):
 def save_rule_kpi_results(session, applied_rules_df, whitelist_df):
     """Calculate and save KPI metrics for applied rules
     
+    Violation counts for all applied rules are computed with one grouped query and written
+    with one multi-row INSERT, instead of a query and an INSERT per rule.
+    
     Args:
         session: Snowflake session
         applied_rules_df: DataFrame of applied rules
@@ -1474,93 +1521,79 @@ def save_rule_kpi_results(session, applied_rules_df, whitelist_df):
     if applied_rules_df.empty:
         return
     
-    # Calculate metrics for each applied rule by counting specific violations
-    for _, rule in applied_rules_df.iterrows():
-        applied_rule_id = rule['APPLIED_RULE_ID']
-        rule_id = rule['RULE_ID']
-        rule_type = rule['RULE_TYPE']
-        
-        # Query to count violations for this specific rule
-        if rule_type == 'Warehouse':
-            # Count warehouses and violations for this specific applied_rule_id
-            query = f"""
-            WITH parsed_violations AS (
-                SELECT 
-                    warehouse_name,
-                    value::VARIANT as violation
-                FROM data_schema.warehouse_compliance_results,
-                LATERAL FLATTEN(input => violations)
-            )
-            SELECT 
-                (SELECT COUNT(DISTINCT warehouse_name) FROM data_schema.warehouse_compliance_results) as total_evaluated,
-                COUNT(DISTINCT CASE 
-                    WHEN violation:applied_rule_id::NUMBER = {applied_rule_id} 
-                         AND violation:is_whitelisted::BOOLEAN = FALSE 
-                    THEN warehouse_name 
-                END) as total_violations,
-                (SELECT COUNT(DISTINCT warehouse_name) FROM data_schema.warehouse_compliance_results) - 
-                COUNT(DISTINCT CASE 
-                    WHEN violation:applied_rule_id::NUMBER = {applied_rule_id} 
-                         AND violation:is_whitelisted::BOOLEAN = FALSE 
-                    THEN warehouse_name 
-                END) as total_compliant
-            FROM parsed_violations
-            """
-        else:  # Database
-            query = f"""
-            WITH parsed_violations AS (
-                SELECT 
-                    object_type,
-                    COALESCE(database_name, '') || '|' || COALESCE(schema_name, '') || '|' || COALESCE(table_name, '') as object_key,
-                    value::VARIANT as violation
-                FROM data_schema.database_compliance_results,
-                LATERAL FLATTEN(input => violations)
-            )
-            SELECT 
-                (SELECT COUNT(*) FROM data_schema.database_compliance_results) as total_evaluated,
-                COUNT(DISTINCT CASE 
-                    WHEN violation:applied_rule_id::NUMBER = {applied_rule_id} 
-                         AND violation:is_whitelisted::BOOLEAN = FALSE 
-                    THEN object_key 
-                END) as total_violations,
-                (SELECT COUNT(*) FROM data_schema.database_compliance_results) - 
-                COUNT(DISTINCT CASE 
-                    WHEN violation:applied_rule_id::NUMBER = {applied_rule_id} 
-                         AND violation:is_whitelisted::BOOLEAN = FALSE 
-                    THEN object_key 
-                END) as total_compliant
-            FROM parsed_violations
-            """
-        
-        result = session.sql(query).to_pandas().iloc[0]
-        total_evaluated = result['TOTAL_EVALUATED']
-        total_violations = result['TOTAL_VIOLATIONS']
-        total_compliant = result['TOTAL_COMPLIANT']
-        
-        # Get whitelisted count for this specific rule
-        whitelist_count = len(whitelist_df[
-            (whitelist_df['RULE_ID'] == rule_id) & 
-            (whitelist_df['APPLIED_RULE_ID'] == applied_rule_id) &
-            (whitelist_df['IS_ACTIVE'] == True)
-        ]) if not whitelist_df.empty else 0
-        
+    # Count non-whitelisted violating objects per applied rule, across both results tables
+    counts_query = """
+    WITH wh_violations AS (
+        SELECT 
+            v.value:applied_rule_id::NUMBER as applied_rule_id,
+            COUNT(DISTINCT warehouse_name) as total_violations
+        FROM data_schema.warehouse_compliance_results,
+        LATERAL FLATTEN(input => violations) v
+        WHERE v.value:is_whitelisted::BOOLEAN = FALSE
+        GROUP BY 1
+    ),
+    db_violations AS (
+        SELECT 
+            v.value:applied_rule_id::NUMBER as applied_rule_id,
+            COUNT(DISTINCT COALESCE(database_name, '') || '|' || COALESCE(schema_name, '') || '|' || COALESCE(table_name, '')) as total_violations
+        FROM data_schema.database_compliance_results,
+        LATERAL FLATTEN(input => violations) v
+        WHERE v.value:is_whitelisted::BOOLEAN = FALSE
+        GROUP BY 1
+    )
+    SELECT 'Warehouse' as rule_type, applied_rule_id, total_violations FROM wh_violations
+    UNION ALL
+    SELECT 'Database', applied_rule_id, total_violations FROM db_violations
+    """
+    totals_query = """
+    SELECT 
+        (SELECT COUNT(DISTINCT warehouse_name) FROM data_schema.warehouse_compliance_results) as wh_total,
+        (SELECT COUNT(*) FROM data_schema.database_compliance_results) as db_total
+    """
+    counts_df = session.sql(counts_query).to_pandas()
+    violation_counts = dict(zip(zip(counts_df['RULE_TYPE'], counts_df['APPLIED_RULE_ID']), counts_df['TOTAL_VIOLATIONS']))
+    totals = session.sql(totals_query).collect()[0]
+    evaluated_totals = {'Warehouse': totals['WH_TOTAL'], 'Database': totals['DB_TOTAL']}
+    
+    # Active whitelist entries per (rule_id, applied_rule_id)
+    if not whitelist_df.empty:
+        active_whitelist = whitelist_df[whitelist_df['IS_ACTIVE'] == True]
+        whitelist_counts = active_whitelist.groupby(['RULE_ID', 'APPLIED_RULE_ID']).size().to_dict()
+    else:
+        whitelist_counts = {}
+    
+    values = []
+    for rule in applied_rules_df.itertuples(index=False):
+        applied_rule_id = rule.APPLIED_RULE_ID
+        rule_type = 'Warehouse' if rule.RULE_TYPE == 'Warehouse' else 'Database'
+        total_evaluated = int(evaluated_totals[rule_type])
+        total_violations = int(violation_counts.get((rule_type, applied_rule_id), 0))
+        total_compliant = total_evaluated - total_violations
+        whitelist_count = int(whitelist_counts.get((rule.RULE_ID, applied_rule_id), 0))
         compliance_rate = (total_compliant / total_evaluated * 100) if total_evaluated > 0 else 0
-        
-        # Insert KPI data
-        insert_query = f"""
-        INSERT INTO data_schema.rule_kpi_results 
-            (applied_rule_id, rule_id, rule_type, total_objects_evaluated, total_violations, 
-             total_compliant, total_whitelisted, compliance_rate)
-        VALUES 
-            ({applied_rule_id}, '{rule_id}', '{rule_type}', {total_evaluated}, {total_violations}, 
-             {total_compliant}, {whitelist_count}, {compliance_rate})
-        """
-        session.sql(insert_query).collect()
+        values.append(
+            f"({applied_rule_id}, '{rule.RULE_ID}', '{rule.RULE_TYPE}', {total_evaluated}, {total_violations}, "
+            f"{total_compliant}, {whitelist_count}, {compliance_rate})"
+        )
+    
+    # Insert KPI data for all rules at once
+    values_sql = ",\n        ".join(values)
+    insert_query = f"""
+    INSERT INTO data_schema.rule_kpi_results 
+        (applied_rule_id, rule_id, rule_type, total_objects_evaluated, total_violations, 
+         total_compliant, total_whitelisted, compliance_rate)
+    VALUES 
+        {values_sql}
+    """
+    session.sql(insert_query).collect()
 
 
 def save_tag_rule_kpi_results(session, applied_tag_rules_df, whitelist_df):
     """Calculate and save KPI metrics for tag rules
     
+    Violation counts for all tag rules are computed with one grouped query and written
+    with one multi-row INSERT, instead of a query and an INSERT per tag rule.
+    
     Args:
         session: Snowflake session
         applied_tag_rules_df: DataFrame of applied tag rules
@@ -1572,66 +1605,62 @@ def save_tag_rule_kpi_results(session, applied_tag_rules_df, whitelist_df):
     if applied_tag_rules_df.empty:
         return
     
-    # Calculate metrics for each applied tag rule
-    for _, rule in applied_tag_rules_df.iterrows():
-        applied_tag_rule_id = rule['APPLIED_TAG_RULE_ID']
-        tag_name = rule['TAG_NAME']
-        object_type = rule['OBJECT_TYPE']
-        
-        # Query to count violations for this specific tag rule
-        query = f"""
-        WITH parsed_violations AS (
-            SELECT 
-                object_name,
-                value::VARIANT as violation
-            FROM data_schema.tag_compliance_results,
-            LATERAL FLATTEN(input => violations)
-            WHERE object_type = '{object_type}'
-        )
-        SELECT 
-            (SELECT COUNT(*) FROM data_schema.tag_compliance_results WHERE object_type = '{object_type}') as total_evaluated,
-            COUNT(DISTINCT CASE 
-                WHEN violation:applied_tag_rule_id::NUMBER = {applied_tag_rule_id} 
-                     AND violation:is_whitelisted::BOOLEAN = FALSE 
-                THEN object_name 
-            END) as total_violations,
-            (SELECT COUNT(*) FROM data_schema.tag_compliance_results WHERE object_type = '{object_type}') - 
-            COUNT(DISTINCT CASE 
-                WHEN violation:applied_tag_rule_id::NUMBER = {applied_tag_rule_id} 
-                     AND violation:is_whitelisted::BOOLEAN = FALSE 
-                THEN object_name 
-            END) as total_compliant
-        FROM parsed_violations
-        """
-        
-        result = session.sql(query).to_pandas().iloc[0]
-        total_evaluated = result['TOTAL_EVALUATED']
-        total_violations = result['TOTAL_VIOLATIONS']
-        total_compliant = result['TOTAL_COMPLIANT']
-        
-        # Get whitelisted count for this specific tag rule
-        whitelist_count = len(whitelist_df[
-            (whitelist_df['RULE_ID'] == 'MISSING_TAG_VALUE') & 
-            (whitelist_df['TAG_NAME'] == tag_name) &
-            (whitelist_df['OBJECT_TYPE'] == object_type) &
-            (whitelist_df['IS_ACTIVE'] == True)
-        ]) if not whitelist_df.empty else 0
-        
+    # Count non-whitelisted violating objects per (object type, applied tag rule)
+    counts_query = """
+    SELECT 
+        object_type,
+        v.value:applied_tag_rule_id::NUMBER as applied_tag_rule_id,
+        COUNT(DISTINCT object_name) as total_violations
+    FROM data_schema.tag_compliance_results,
+    LATERAL FLATTEN(input => violations) v
+    WHERE v.value:is_whitelisted::BOOLEAN = FALSE
+    GROUP BY 1, 2
+    """
+    totals_query = """
+    SELECT object_type, COUNT(*) as total_evaluated
+    FROM data_schema.tag_compliance_results
+    GROUP BY object_type
+    """
+    counts_df = session.sql(counts_query).to_pandas()
+    violation_counts = dict(zip(zip(counts_df['OBJECT_TYPE'], counts_df['APPLIED_TAG_RULE_ID']), counts_df['TOTAL_VIOLATIONS']))
+    totals_df = session.sql(totals_query).to_pandas()
+    evaluated_totals = dict(zip(totals_df['OBJECT_TYPE'], totals_df['TOTAL_EVALUATED']))
+    
+    # Active MISSING_TAG_VALUE whitelist entries per (tag_name, object_type)
+    if not whitelist_df.empty:
+        tag_whitelist = whitelist_df[(whitelist_df['RULE_ID'] == 'MISSING_TAG_VALUE') & (whitelist_df['IS_ACTIVE'] == True)]
+        whitelist_counts = tag_whitelist.groupby(['TAG_NAME', 'OBJECT_TYPE']).size().to_dict()
+    else:
+        whitelist_counts = {}
+    
+    values = []
+    for rule in applied_tag_rules_df.itertuples(index=False):
+        applied_tag_rule_id = rule.APPLIED_TAG_RULE_ID
+        tag_name = rule.TAG_NAME
+        object_type = rule.OBJECT_TYPE
+        total_evaluated = int(evaluated_totals.get(object_type, 0))
+        total_violations = int(violation_counts.get((object_type, applied_tag_rule_id), 0))
+        total_compliant = total_evaluated - total_violations
+        whitelist_count = int(whitelist_counts.get((tag_name, object_type), 0))
         compliance_rate = (total_compliant / total_evaluated * 100) if total_evaluated > 0 else 0
         
         # Escape single quotes in tag name
         tag_name_escaped = tag_name.replace("'", "''")
-        
-        # Insert KPI data
-        insert_query = f"""
-        INSERT INTO data_schema.tag_rule_kpi_results 
-            (applied_tag_rule_id, tag_name, object_type, total_objects_evaluated, total_violations, 
-             total_compliant, total_whitelisted, compliance_rate)
-        VALUES 
-            ({applied_tag_rule_id}, '{tag_name_escaped}', '{object_type}', {total_evaluated}, {total_violations}, 
-             {total_compliant}, {whitelist_count}, {compliance_rate})
-        """
-        session.sql(insert_query).collect()
+        values.append(
+            f"({applied_tag_rule_id}, '{tag_name_escaped}', '{object_type}', {total_evaluated}, {total_violations}, "
+            f"{total_compliant}, {whitelist_count}, {compliance_rate})"
+        )
+    
+    # Insert KPI data for all tag rules at once
+    values_sql = ",\n        ".join(values)
+    insert_query = f"""
+    INSERT INTO data_schema.tag_rule_kpi_results 
+        (applied_tag_rule_id, tag_name, object_type, total_objects_evaluated, total_violations, 
+         total_compliant, total_whitelisted, compliance_rate)
+    VALUES 
+        {values_sql}
+    """
+    session.sql(insert_query).collect()
 
 
 def get_rule_kpi_results(session, applied_rule_id=None):
@@ -1692,3 +1721,113 @@ def get_tag_rule_kpi_results(session, applied_tag_rule_id=None):
     ORDER BY object_type, tag_name
     """
     return session.sql(query).to_pandas()
+
+
+def get_violation_counts_by_rule(session):
+    """Retrieve violation counts for all applied rules and tag rules in one query
+    
+    Reads only the id and count columns of the KPI tables written by Run Rules,
+    for screens that show counts without the rest of the KPI metrics.
+    
+    Args:
+        session: Snowflake session
+    
+    Returns:
+        DataFrame with RULE_KIND ('RULE' or 'TAG'), APPLIED_ID and VIOLATION_COUNT
+    """
+    query = """
+    SELECT 'RULE' AS rule_kind, applied_rule_id AS applied_id, total_violations AS violation_count
+    FROM data_schema.rule_kpi_results
+    UNION ALL
+    SELECT 'TAG' AS rule_kind, applied_tag_rule_id AS applied_id, total_violations AS violation_count
+    FROM data_schema.tag_rule_kpi_results
+    """
+    return session.sql(query).to_pandas()
+
+
+# ===================================
+# CACHED READ FUNCTIONS
+# ===================================
+
+# The rule DataFrames below are held with st.cache_resource so reruns share one
+# instance instead of receiving a deep copy; callers must treat them as read-only.
+# conn_key (see get_connection_key) is hashed so entries are scoped per connection.
+
+@st.cache_resource(ttl=300, show_spinner=False)
+def get_config_rules_cached(_session, conn_key=None):
+    """Shared get_config_rules result for UI reruns; invalidate with clear_rule_caches()"""
+    return get_config_rules(_session)
+
+
+@st.cache_resource(ttl=300, show_spinner=False)
+def get_applied_rules_cached(_session, conn_key=None):
+    """Shared get_applied_rules result for UI reruns; invalidate with clear_rule_caches()
+    
+    Adds the display columns APPLIED_AT_STR and THRESHOLD_INT once per cache fill, vectorized,
+    so rule cards do not format each row's timestamp and threshold on every rerun.
+    """
+    df = get_applied_rules(_session)
+    if not df.empty:
+        df['APPLIED_AT_STR'] = df['APPLIED_AT'].dt.strftime('%Y-%m-%d %H:%M')
+        df['THRESHOLD_INT'] = df['THRESHOLD_VALUE'].astype('int64')
+    return df
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def get_applied_tag_rules_cached(_session, conn_key=None):
+    """Cached get_applied_tag_rules for UI reruns; invalidate with clear_rule_caches()
+    
+    Adds the display column APPLIED_AT_STR once per cache fill, vectorized, as
+    get_applied_rules_cached does for rule cards.
+    """
+    df = get_applied_tag_rules(_session)
+    if not df.empty:
+        df['APPLIED_AT_STR'] = df['APPLIED_AT'].dt.strftime('%Y-%m-%d %H:%M')
+    return df
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def get_wh_statement_timeout_default_cached(_session, conn_key=None):
+    """Cached get_wh_statement_timeout_default; depends on applied rules, so cleared by clear_rule_caches()"""
+    return get_wh_statement_timeout_default(_session)
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def get_available_tags_cached(_session, conn_key=None):
+    """Cached get_available_tags with a FULL_TAG_NAME column; ACCOUNT_USAGE lags anyway, so only the refresh button clears it"""
+    tags_df = get_available_tags(_session)
+    tags_df['FULL_TAG_NAME'] = tags_df['TAG_DATABASE'] + '.' + tags_df['TAG_SCHEMA'] + '.' + tags_df['TAG_NAME']
+    return tags_df
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def get_available_tag_names_cached(_session, conn_key=None):
+    """Cached get_available_tag_names; ACCOUNT_USAGE lags anyway, so only the refresh button clears it"""
+    return get_available_tag_names(_session)
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def get_whitelisted_violations_cached(_session, conn_key=None):
+    """Cached get_whitelisted_violations; cleared by callers after whitelist entries are added or removed"""
+    return get_whitelisted_violations(_session)
+
+
+def clear_rule_caches():
+    """Clear the cached rule lookups after rules are applied or deactivated"""
+    get_config_rules_cached.clear()
+    get_applied_rules_cached.clear()
+    get_applied_tag_rules_cached.clear()
+    get_wh_statement_timeout_default_cached.clear()
+    st.session_state.pop('wh_default_timeout', None)
+
+
+def clear_whitelist_caches():
+    """Invalidate everything that embeds whitelist state after entries are added or removed
+    
+    Clears the cached whitelist, drops the reused database/tag result pages and bumps
+    tag_cache_gen so the tag tab's cached metrics are recomputed.
+    """
+    get_whitelisted_violations_cached.clear()
+    st.session_state.pop('db_last_page', None)
+    st.session_state.pop('tag_last_page', None)
+    st.session_state.tag_cache_gen = st.session_state.get('tag_cache_gen', 0) + 1
@@ -5,11 +5,26 @@ Handles the display of database, schema, and table compliance status and remedia
 
 import streamlit as st
 import pandas as pd
-from database import (get_database_retention_details, get_applied_rules, execute_sql, 
-                      get_tag_compliance_details, get_whitelisted_violations, add_to_whitelist, 
+from database import (get_database_retention_details, get_applied_rules_cached, get_connection_key, execute_sql, 
+                      get_tag_compliance_details, clear_whitelist_caches, add_to_whitelist, 
                       get_db_compliance_results_paginated, get_db_compliance_metrics)
 from compliance import generate_table_fix_sql
-from ui_utils import render_refresh_button, render_section_header, render_filter_button, render_pagination_controls
+from ui_utils import render_refresh_button, render_section_header, render_filter_button, render_pagination_controls, split_violations
+
+
+def _partition_violations(violations):
+    """Split an object's violations by whitelist status and collect its fix flags
+    
+    Args:
+        violations: The object's violations
+    
+    Returns:
+        tuple: (whitelisted_violations, non_whitelisted_violations, has_fix_button, has_fix_sql)
+    """
+    whitelisted, non_whitelisted = split_violations(violations)
+    has_fix_button = any(v.get('has_fix_button') for v in violations)
+    has_fix_sql = any(v.get('has_fix_sql') for v in violations)
+    return whitelisted, non_whitelisted, has_fix_button, has_fix_sql
 
 
 def render_database_compliance_tab(session):
@@ -34,14 +49,15 @@ def render_database_compliance_tab(session):
         render_section_header("Database Compliance", "db-icon")
     with col_refresh:
         if st.button("↻", key="refresh_tab_db_compliance", help="Refresh data", type="secondary"):
+            st.session_state.pop('db_last_page', None)
             st.rerun()
     st.markdown("---")
     
     # Get applied database rules
-    applied_rules_df = get_applied_rules(session)
-    db_rules = applied_rules_df[applied_rules_df['RULE_TYPE'] == 'Database']
+    applied_rules_df = get_applied_rules_cached(session, get_connection_key(session))
     
-    if db_rules.empty:
+    # Only the presence of database rules matters here, so skip building a filtered frame
+    if not (applied_rules_df['RULE_TYPE'] == 'Database').any():
         st.info("No database rules have been applied yet. Go to the Rule Configuration tab to apply database rules.")
         return
     
@@ -108,18 +124,26 @@ def render_database_compliance_tab(session):
     }
     status_filter = filter_to_status.get(st.session_state.db_compliance_filter, "all")
     
-    try:
-        compliance_data, total_count = get_db_compliance_results_paginated(
-            session,
-            object_type=object_type_for_query,
-            search_term=st.session_state.db_search_term if st.session_state.db_search_term else None,
-            status_filter=status_filter,
-            limit=st.session_state.db_page_size,
-            offset=offset
-        )
-    except Exception as e:
-        st.error(f"Error loading compliance data: {str(e)}")
-        compliance_data, total_count = [], 0
+    # Reuse the last fetched page when only UI state (e.g. Show/Hide SQL) changed
+    query_key = (object_type_for_query, st.session_state.db_search_term, status_filter,
+                 st.session_state.db_page_size, offset)
+    if st.session_state.get('db_last_query_key') == query_key and 'db_last_page' in st.session_state:
+        compliance_data, total_count = st.session_state.db_last_page
+    else:
+        try:
+            compliance_data, total_count = get_db_compliance_results_paginated(
+                session,
+                object_type=object_type_for_query,
+                search_term=st.session_state.db_search_term if st.session_state.db_search_term else None,
+                status_filter=status_filter,
+                limit=st.session_state.db_page_size,
+                offset=offset
+            )
+            st.session_state.db_last_query_key = query_key
+            st.session_state.db_last_page = (compliance_data, total_count)
+        except Exception as e:
+            st.error(f"Error loading compliance data: {str(e)}")
+            compliance_data, total_count = [], 0
     
     # Render pagination controls
     new_page_size, new_page = render_pagination_controls(
@@ -137,12 +161,15 @@ def render_database_compliance_tab(session):
     
     st.markdown("---")
     
+    # Partition each object's violations once; the sort, the cards and the bulk actions share it
+    page_items = [(obj, _partition_violations(obj['violations'])) for obj in compliance_data]
+    
     # Sort if "Non-Compliant First" is selected (filtering already done at DB level)
     view_filter = st.session_state.db_compliance_filter
-    filtered_data = compliance_data
     
     if view_filter == "Non-Compliant First":
-        filtered_data = sorted(filtered_data, key=lambda x: (len([v for v in x['violations'] if not v.get('is_whitelisted', False)]) == 0, str(x.get('database_name', ''))))
+        page_items.sort(key=lambda item: (not item[1][1], str(item[0].get('database_name', ''))))
+    filtered_data = [obj for obj, _ in page_items]
     
     # Display results
     if not filtered_data:
@@ -151,12 +178,13 @@ def render_database_compliance_tab(session):
     
     st.markdown(f"#### Showing {len(filtered_data)} Objects")
     
+    # Objects whose SQL panel is open, one set instead of a session key per object
+    open_sql = st.session_state.setdefault('db_open_sql', set())
+    
     # Display objects grouped by type
-    for obj_comp in filtered_data:
+    for obj_comp, partition in page_items:
         # Separate whitelisted and non-whitelisted violations
-        all_violations = obj_comp['violations']
-        whitelisted_violations = [v for v in all_violations if v.get('is_whitelisted', False)]
-        non_whitelisted_violations = [v for v in all_violations if not v.get('is_whitelisted', False)]
+        whitelisted_violations, non_whitelisted_violations, obj_fix_button, obj_fix_sql = partition
         
         # Determine if compliant (based on non-whitelisted violations)
         is_compliant = not non_whitelisted_violations
@@ -281,6 +309,7 @@ def render_database_compliance_tab(session):
                                             reason=f"Whitelisted from UI"
                                         )
                                         st.success(f"Violation whitelisted for {obj_name}")
+                                        clear_whitelist_caches()
                                         st.rerun()
                                     except Exception as e:
                                         st.error(f"Error whitelisting: {str(e)}")
@@ -291,8 +320,8 @@ def render_database_compliance_tab(session):
                     obj_key = f"{obj_comp['database_name']}_{obj_comp.get('schema_name', '')}_{obj_comp.get('table_name', '')}_{object_type}"
                     
                     # Check if any violation has fix_button or fix_sql enabled
-                    has_any_fix_button = any(v.get('has_fix_button', False) for v in obj_comp['violations'])
-                    has_any_fix_sql = any(v.get('has_fix_sql', False) for v in obj_comp['violations'])
+                    has_any_fix_button = obj_fix_button
+                    has_any_fix_sql = obj_fix_sql
                     
                     if has_any_fix_button or has_any_fix_sql:
                         if has_any_fix_button:
@@ -312,16 +341,17 @@ def render_database_compliance_tab(session):
                                             execute_sql(session, fix_sql)
                                     
                                     st.success(f"{object_type.title()} configuration updated successfully!")
+                                    st.session_state.pop('db_last_page', None)
                                     st.rerun()
                                 except Exception as e:
                                     st.error(f"Error updating {object_type.lower()}: {str(e)}")
                         
                         if has_any_fix_sql:
                             if st.button("Show SQL", key=f"sql_{obj_key}", use_container_width=True):
-                                st.session_state[f'show_sql_{obj_key}'] = True
+                                open_sql.add(obj_key)
                 
                 # Show SQL if button was clicked
-                if st.session_state.get(f'show_sql_{obj_key}', False):
+                if obj_key in open_sql:
                     sql_statements = []
                     for violation in obj_comp['violations']:
                         if violation.get('has_fix_sql', False):
@@ -340,7 +370,7 @@ def render_database_compliance_tab(session):
                         st.code(combined_sql, language="sql")
                         
                         if st.button("Hide SQL", key=f"hide_sql_{obj_key}"):
-                            st.session_state[f'show_sql_{obj_key}'] = False
+                            open_sql.discard(obj_key)
                             st.rerun()
             
             # Show compliant rules if there are any
@@ -367,14 +397,8 @@ def render_database_compliance_tab(session):
         st.markdown("#### Bulk Actions")
         
         # Check if any object has fix options enabled
-        has_any_fix_button = any(
-            any(v.get('has_fix_button', False) for v in obj['violations'])
-            for obj in filtered_data if obj['violations']
-        )
-        has_any_fix_sql = any(
-            any(v.get('has_fix_sql', False) for v in obj['violations'])
-            for obj in filtered_data if obj['violations']
-        )
+        has_any_fix_button = any(partition[2] for _, partition in page_items)
+        has_any_fix_sql = any(partition[3] for _, partition in page_items)
         
         if has_any_fix_button or has_any_fix_sql:
             button_cols = []
@@ -408,6 +432,7 @@ def render_database_compliance_tab(session):
                                             fixed_count += 1
                             
                             st.success(f"Fixed {fixed_count} violations across {len(filtered_data)} objects!")
+                            st.session_state.pop('db_last_page', None)
                             st.rerun()
                         except Exception as e:
                             st.error(f"Error during bulk fix: {str(e)}")
@@ -4,339 +4,434 @@ Displays data from all tables in the data_schema and allows custom SQL queries
 """
 
 import streamlit as st
-import pandas as pd
-from ui_utils import render_refresh_button, render_section_header, render_count_metric
+from ui_utils import render_refresh_button, render_section_header, render_query_block
 
 
-def render_details_tab(session):
-    """Render the Details tab showing all data_schema tables"""
-    # Refresh button in top right
-    col_title, col_refresh = render_refresh_button("tab5")
-    with col_title:
-        render_section_header("Application Data Inspector", "chart-icon")
-    with col_refresh:
-        if st.button("↻", key="refresh_tab_details", help="Refresh data", type="secondary"):
-            st.rerun()
-    st.markdown("---")
+# SQL text for the inspector tables and summary, allocated once at import
+_SQL_WAREHOUSE_DETAILS = """
+SELECT 
+    name, type, size, auto_suspend, statement_timeout_in_seconds,
+    owner, min_cluster_count, max_cluster_count, scaling_policy,
+    max_concurrency_level, statement_queued_timeout_in_seconds,
+    created_on, updated_on, comment, capture_timestamp
+FROM data_schema.warehouse_details
+ORDER BY capture_timestamp DESC, name
+LIMIT 100
+"""
+
+_SQL_DB_RETENTION = """
+SELECT 
+    object_type, database_name, schema_name, table_name, table_type,
+    data_retention_time_in_days, owner, row_count, bytes,
+    created_on, last_altered, comment, capture_timestamp
+FROM data_schema.database_retention_details
+ORDER BY capture_timestamp DESC, object_type,database_name, schema_name, table_name
+LIMIT 100
+"""
+
+_SQL_CONFIG_RULES = """
+SELECT 
+    rule_id, rule_name, rule_description, rule_type,
+    check_parameter, comparison_operator, unit,
+    is_active, created_at, updated_at
+FROM data_schema.config_rules
+ORDER BY rule_type, rule_name, rule_id
+"""
+
+_SQL_APPLIED_RULES = """
+SELECT 
+    applied_rule_id, rule_id, rule_name, threshold_value,
+    rule_type, check_parameter, comparison_operator, unit,
+    applied_at, applied_by, is_active
+FROM data_schema.v_applied_rules_enriched
+ORDER BY applied_at DESC, applied_rule_id
+"""
+
+_SQL_APPLIED_TAG_RULES = """
+SELECT 
+    applied_tag_rule_id, tag_name, object_type,
+    applied_at, applied_by, is_active
+FROM data_schema.applied_tag_rules
+ORDER BY applied_at DESC
+"""
+
+_SQL_TAG_COMPLIANCE_DETAILS = """
+SELECT 
+    object_type, object_database, object_schema, object_name,
+    tag_name, tag_value, capture_timestamp
+FROM data_schema.tag_compliance_details
+ORDER BY capture_timestamp DESC, object_type, object_name, tag_name
+LIMIT 100
+"""
+
+_SQL_RULE_WHITELIST = """
+SELECT 
+    rw.whitelist_id, rw.rule_id, rw.applied_rule_id, rw.object_type, 
+    rw.object_name, rw.database_name, rw.schema_name, rw.table_name,
+    cr.rule_name, rw.reason, rw.whitelisted_by, rw.whitelisted_at, rw.is_active
+FROM data_schema.rule_whitelist rw
+LEFT JOIN data_schema.config_rules cr ON rw.rule_id = cr.rule_id
+ORDER BY rw.whitelisted_at DESC, rw.whitelist_id
+"""
+
+_SQL_SUMMARY_COUNTS = """
+SELECT 
+(SELECT COUNT(*) FROM data_schema.warehouse_details) AS wh,
+(SELECT COUNT(*) FROM data_schema.database_retention_details) AS dr,
+(SELECT COUNT(*) FROM data_schema.config_rules WHERE is_active = TRUE) AS cr,
+(SELECT COUNT(*) FROM data_schema.applied_rules WHERE is_active = TRUE) AS ar,
+(SELECT COUNT(*) FROM data_schema.applied_tag_rules WHERE is_active = TRUE) AS atr,
+(SELECT COUNT(*) FROM data_schema.rule_whitelist WHERE is_active = TRUE) AS wl
+"""
+
+_SQL_SHOW_TASKS = "SHOW TASKS IN DATABASE"
+
+_SQL_TASKS_PROJECTION = """
+SELECT "name", "state", "warehouse", "schedule", "owner", "created_on", "last_committed_on"
+FROM TABLE(RESULT_SCAN('{query_id}'))
+"""
+
+
+# Rows fetched per page for paginated inspector tables
+DETAIL_PAGE_SIZE = 100
+
+
+# Summary statistics metrics: (label, column of _SQL_SUMMARY_COUNTS)
+SUMMARY_LABELS = [
+    ("Warehouse Records", "WH"),
+    ("Database Retention Records", "DR"),
+    ("Active Rules", "CR"),
+    ("Applied Rules", "AR"),
+    ("Applied Tag Rules", "ATR"),
+    ("Whitelisted Violations", "WL"),
+]
+
+
+# Inspector tables rendered as expanders, in display order.
+# Entries without SQL are loaded by a dedicated loader (see _load_tasks);
+# "paginate" marks unbounded tables that are fetched DETAIL_PAGE_SIZE rows at a time;
+# "sources" lists the data_schema tables whose changes invalidate the cached result.
+TABLES = [
+    {
+        "key": "warehouse_details",
+        "sources": ["warehouse_details"],
+        "title": "Warehouse Details",
+        "sql": _SQL_WAREHOUSE_DETAILS,
+        "empty_msg": "No warehouse details data available. The warehouse_monitor_task will populate this table.",
+        "error_label": "warehouse details",
+    },
+    {
+        "key": "database_retention_details",
+        "sources": ["database_retention_details"],
+        "title": "Database Retention Details",
+        "sql": _SQL_DB_RETENTION,
+        "empty_msg": "No database retention data available. The db_retention_monitor_task will populate this table.",
+        "error_label": "database retention details",
+    },
+    {
+        "key": "config_rules",
+        "sources": ["config_rules"],
+        "title": "Configuration Rules",
+        "sql": _SQL_CONFIG_RULES,
+        "empty_msg": "No configuration rules found.",
+        "error_label": "configuration rules",
+        "paginate": True,
+    },
+    {
+        "key": "applied_rules",
+        "sources": ["applied_rules", "config_rules"],
+        "title": "Applied Rules",
+        "sql": _SQL_APPLIED_RULES,
+        "empty_msg": "No rules have been applied yet.",
+        "error_label": "applied rules",
+        "paginate": True,
+    },
+    {
+        "key": "applied_tag_rules",
+        "sources": ["applied_tag_rules"],
+        "title": "Applied Tag Rules",
+        "sql": _SQL_APPLIED_TAG_RULES,
+        "empty_msg": "No tag rules have been applied yet.",
+        "error_label": "applied tag rules",
+    },
+    {
+        "key": "tag_compliance_details",
+        "sources": ["tag_compliance_details"],
+        "title": "Tag Compliance Details",
+        "sql": _SQL_TAG_COMPLIANCE_DETAILS,
+        "empty_msg": "No tag compliance data available. The tag_monitor_task will populate this table.",
+        "error_label": "tag compliance details",
+    },
+    {
+        "key": "rule_whitelist",
+        "sources": ["rule_whitelist", "config_rules"],
+        "title": "Rule Whitelist",
+        "sql": _SQL_RULE_WHITELIST,
+        "empty_msg": "No whitelisted violations yet.",
+        "error_label": "rule whitelist",
+        "paginate": True,
+    },
+    {
+        "key": "tasks",
+        "sources": [],
+        "title": "Tasks",
+        "sql": None,
+        "count_label": "Total Tasks",
+        "empty_msg": "No tasks found in data_schema.",
+        "error_label": "tasks",
+    },
+]
+
+
+# Tables whose change tokens are tracked by _table_versions
+_VERSIONED_TABLES = sorted({source for cfg in TABLES for source in cfg["sources"]})
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _table_versions(_session):
+    """
+    Fetch a change token for every inspected data_schema table in one round-trip
     
-    st.markdown("""
-    Explore all configuration data collected by the application. View warehouse configurations, 
-    retention policies, active rules, and task execution details. Execute custom SQL queries to analyze your data.
-    """)
+    The token changes whenever a DML statement commits against the table, so it
+    is used as part of the cache key of the loaders below.
     
-    st.markdown("---")
+    Args:
+        _session: Snowflake session (not hashed by Streamlit)
     
-    # Table 1: Warehouse Details
-    with st.expander("Warehouse Details", expanded=False):
-        try:
-            query = """
-            SELECT 
-                name, type, size, auto_suspend, statement_timeout_in_seconds,
-                owner, min_cluster_count, max_cluster_count, scaling_policy,
-                max_concurrency_level, statement_queued_timeout_in_seconds,
-                created_on, updated_on, comment, capture_timestamp
-            FROM data_schema.warehouse_details
-            ORDER BY capture_timestamp DESC, name
-            LIMIT 100
-            """
-            df = session.sql(query).to_pandas()
-            
-            if not df.empty:
-                st.markdown(f"**Total Records:** {len(df)}")
-                st.dataframe(df, use_container_width=True, hide_index=True)
-            else:
-                st.info("No warehouse details data available. The warehouse_monitor_task will populate this table.")
-        except Exception as e:
-            st.error(f"Error loading warehouse details: {str(e)}")
+    Returns:
+        Dictionary of change tokens keyed by table name
+    """
+    columns = ",\n        ".join(
+        f"SYSTEM$LAST_CHANGE_COMMIT_TIME('data_schema.{table}') AS {table}" for table in _VERSIONED_TABLES
+    )
+    row = _session.sql(f"SELECT {columns}").collect()[0].as_dict()
+    return {table: row[table.upper()] for table in _VERSIONED_TABLES}
+
+
+def _get_table_versions(session):
+    """
+    Return the current change tokens, or an empty dict when they cannot be read
     
-    # Table 2: Database Retention Details
-    with st.expander("Database Retention Details", expanded=False):
-        try:
-            query = """
-            SELECT 
-                object_type, database_name, schema_name, table_name, table_type,
-                data_retention_time_in_days, owner, row_count, bytes,
-                created_on, last_altered, comment, capture_timestamp
-            FROM data_schema.database_retention_details
-            ORDER BY capture_timestamp DESC, object_type,database_name, schema_name, table_name
-            LIMIT 100
-            """
-            df = session.sql(query).to_pandas()
-            
-            if not df.empty:
-                st.markdown(f"**Total Records:** {len(df)}")
-                st.dataframe(df, use_container_width=True, hide_index=True)
-            else:
-                st.info("No database retention data available. The db_retention_monitor_task will populate this table.")
-        except Exception as e:
-            st.error(f"Error loading database retention details: {str(e)}")
+    Without a token the loaders below are bypassed and the query runs uncached.
     
-    # Table 3: Configuration Rules
-    with st.expander("Configuration Rules", expanded=False):
-        try:
-            query = """
-            SELECT 
-                rule_id, rule_name, rule_description, rule_type,
-                check_parameter, comparison_operator, unit,
-                is_active, created_at, updated_at
-            FROM data_schema.config_rules
-            ORDER BY rule_type, rule_name
-            """
-            df = session.sql(query).to_pandas()
-            
-            if not df.empty:
-                st.markdown(f"**Total Records:** {len(df)}")
-                st.dataframe(df, use_container_width=True, hide_index=True)
-            else:
-                st.info("No configuration rules found.")
-        except Exception as e:
-            st.error(f"Error loading configuration rules: {str(e)}")
+    Args:
+        session: Snowflake session
     
-    # Table 4: Applied Rules
-    with st.expander("Applied Rules", expanded=False):
-        try:
-            query = """
-            SELECT 
-                ar.applied_rule_id, ar.rule_id, cr.rule_name, ar.threshold_value,
-                cr.rule_type, cr.check_parameter, cr.comparison_operator, cr.unit,
-                ar.applied_at, ar.applied_by, ar.is_active
-            FROM data_schema.applied_rules ar
-            JOIN data_schema.config_rules cr ON ar.rule_id = cr.rule_id
-            ORDER BY ar.applied_at DESC
-            """
-            df = session.sql(query).to_pandas()
-            
-            if not df.empty:
-                st.markdown(f"**Total Records:** {len(df)}")
-                st.dataframe(df, use_container_width=True, hide_index=True)
-            else:
-                st.info("No rules have been applied yet.")
-        except Exception as e:
-            st.error(f"Error loading applied rules: {str(e)}")
+    Returns:
+        Dictionary of change tokens keyed by table name
+    """
+    try:
+        return _table_versions(session)
+    except Exception:
+        return {}
+
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _load_table(_session, query, version):
+    """
+    Cached _query_table, keyed on the source tables' change tokens
     
-    # Table 5: Applied Tag Rules
-    with st.expander("Applied Tag Rules", expanded=False):
-        try:
-            query = """
-            SELECT 
-                applied_tag_rule_id, tag_name, object_type,
-                applied_at, applied_by, is_active
-            FROM data_schema.applied_tag_rules
-            ORDER BY applied_at DESC
-            """
-            df = session.sql(query).to_pandas()
-            
-            if not df.empty:
-                st.markdown(f"**Total Records:** {len(df)}")
-                st.dataframe(df, use_container_width=True, hide_index=True)
-            else:
-                st.info("No tag rules have been applied yet.")
-        except Exception as e:
-            st.error(f"Error loading applied tag rules: {str(e)}")
+    Only called with real version tokens; without them the query runs uncached.
     
-    # Table 6: Tag Compliance Details
-    with st.expander("Tag Compliance Details", expanded=False):
-        try:
-            query = """
-            SELECT 
-                object_type, object_database, object_schema, object_name,
-                tag_name, tag_value, capture_timestamp
-            FROM data_schema.tag_compliance_details
-            ORDER BY capture_timestamp DESC, object_type, object_name, tag_name
-            LIMIT 100
-            """
-            df = session.sql(query).to_pandas()
-            
-            if not df.empty:
-                st.markdown(f"**Total Records:** {len(df)}")
-                st.dataframe(df, use_container_width=True, hide_index=True)
-            else:
-                st.info("No tag compliance data available. The tag_monitor_task will populate this table.")
-        except Exception as e:
-            st.error(f"Error loading tag compliance details: {str(e)}")
+    Args:
+        _session: Snowflake session (not hashed by Streamlit)
+        query: SQL text; also serves as the cache key
+        version: Change tokens of the source tables; a new value invalidates the entry
     
-    # Table 7: Rule Whitelist
-    with st.expander("Rule Whitelist", expanded=False):
-        try:
-            query = """
-            SELECT 
-                rw.whitelist_id, rw.rule_id, rw.applied_rule_id, rw.object_type, 
-                rw.object_name, rw.database_name, rw.schema_name, rw.table_name,
-                cr.rule_name, rw.reason, rw.whitelisted_by, rw.whitelisted_at, rw.is_active
-            FROM data_schema.rule_whitelist rw
-            LEFT JOIN data_schema.config_rules cr ON rw.rule_id = cr.rule_id
-            ORDER BY rw.whitelisted_at DESC
-            """
-            df = session.sql(query).to_pandas()
-            
-            if not df.empty:
-                st.markdown(f"**Total Records:** {len(df)}")
-                st.dataframe(df, use_container_width=True, hide_index=True)
-            else:
-                st.info("No whitelisted violations yet.")
-        except Exception as e:
-            st.error(f"Error loading rule whitelist: {str(e)}")
+    Returns:
+        DataFrame with the query results
+    """
+    return _query_table(_session, query)
+
+
+def _query_table(session, query):
+    """
+    Run a read-only inspector query
     
-    # Table 8: Tasks Information
-    with st.expander("Tasks", expanded=False):
-        try:
-            query = """
-            SHOW TASKS IN DATABASE;
-            """
-            df = session.sql(query).to_pandas()
-            
-            if not df.empty:
-                st.markdown(f"**Total Tasks:** {len(df)}")
-                # Select relevant columns
-                display_cols = ['name', 'state', 'warehouse', 'schedule', 'owner', 'created_on', 'last_committed_on']
-                available_cols = [col for col in display_cols if col in df.columns or col.upper() in df.columns]
-                
-                if available_cols:
-                    # Handle case sensitivity
-                    display_df = df.copy()
-                    for col in available_cols:
-                        if col.upper() in display_df.columns and col not in display_df.columns:
-                            display_df[col] = display_df[col.upper()]
-                    
-                    st.dataframe(display_df[available_cols], use_container_width=True, hide_index=True)
-                else:
-                    st.dataframe(df, use_container_width=True, hide_index=True)
-            else:
-                st.info("No tasks found in data_schema.")
-        except Exception as e:
-            st.error(f"Error loading tasks: {str(e)}")
+    Args:
+        session: Snowflake session
+        query: SQL text
     
-    # Summary Statistics
-    st.markdown("---")
-    render_section_header("Summary Statistics", "chart-icon")
+    Returns:
+        DataFrame with the query results
+    """
+    return session.sql(query).to_pandas()
+
+
+@st.cache_data(ttl=600, show_spinner=False)
+def _fetch_all_counts(_session, version):
+    """
+    Cached _query_all_counts, keyed on the counted tables' change tokens
     
-    col1, col2, col3, col4, col5, col6 = st.columns(6)
+    Only called with real version tokens; without them the counts are fetched uncached.
     
-    with col1:
-        render_count_metric(session, "SELECT COUNT(*) as cnt FROM data_schema.warehouse_details", "Warehouse Records")
+    Args:
+        _session: Snowflake session (not hashed by Streamlit)
+        version: Change tokens of the counted tables; a new value invalidates the entry
     
-    with col2:
-        render_count_metric(session, "SELECT COUNT(*) as cnt FROM data_schema.database_retention_details", "Database Retention Records")
+    Returns:
+        Dictionary of counts keyed by WH, DR, CR, AR, ATR and WL
+    """
+    return _query_all_counts(_session)
+
+
+def _query_all_counts(session):
+    """
+    Fetch all summary statistics counts in a single round-trip
     
-    with col3:
-        render_count_metric(session, "SELECT COUNT(*) as cnt FROM data_schema.config_rules WHERE is_active = TRUE", "Active Rules")
+    Args:
+        session: Snowflake session
     
-    with col4:
-        render_count_metric(session, "SELECT COUNT(*) as cnt FROM data_schema.applied_rules WHERE is_active = TRUE", "Applied Rules")
+    Returns:
+        Dictionary of counts keyed by WH, DR, CR, AR, ATR and WL
+    """
+    return session.sql(_SQL_SUMMARY_COUNTS).collect()[0].as_dict()
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _load_tasks(_session):
+    """
+    Retrieve the task overview, projecting only the displayed columns server-side
     
-    with col5:
-        render_count_metric(session, "SELECT COUNT(*) as cnt FROM data_schema.applied_tag_rules WHERE is_active = TRUE", "Applied Tag Rules")
+    Args:
+        _session: Snowflake session (not hashed by Streamlit)
     
-    with col6:
-        render_count_metric(session, "SELECT COUNT(*) as cnt FROM data_schema.rule_whitelist WHERE is_active = TRUE", "Whitelisted Violations")
+    Returns:
+        DataFrame with one row per task in the database
+    """
+    # Scan the SHOW result by its own query id rather than LAST_QUERY_ID(),
+    # which is not reliable while other queries run on the same session
+    show_job = _session.sql(_SQL_SHOW_TASKS).collect_nowait()
+    show_job.result("no_result")
+    return _session.sql(_SQL_TASKS_PROJECTION.format(query_id=show_job.query_id)).to_pandas()
 
-    # Custom SQL Query Section
+
+def _load_requested(key):
+    """
+    Render a Load button inside a collapsed expander and report whether its data should be shown
+    
+    Args:
+        key: Unique key for the table being inspected
+    
+    Returns:
+        True once the user has asked to load the table in this session
+    """
+    state_key = f"details_loaded_{key}"
+    if not st.session_state.get(state_key, False):
+        if st.button("Load", key=f"details_load_{key}"):
+            st.session_state[state_key] = True
+    return st.session_state.get(state_key, False)
+
+
+def _paginate(sql, page, page_size):
+    """
+    Restrict an ordered query to one page of results
+    
+    Args:
+        sql: SQL query ending in an ORDER BY clause
+        page: Page number (1-indexed)
+        page_size: Rows per page
+    
+    Returns:
+        SQL query with LIMIT/OFFSET applied
+    """
+    return f"{sql.rstrip()}\nLIMIT {int(page_size)} OFFSET {(int(page) - 1) * int(page_size)}"
+
+
+def _table_sql(cfg):
+    """Return the SQL to run for a table descriptor, applying the selected page if paginated"""
+    if cfg.get("paginate"):
+        return _paginate(cfg["sql"], st.session_state.get(f"details_page_{cfg['key']}", 1), DETAIL_PAGE_SIZE)
+    return cfg["sql"]
+
+
+def _source_version(sources, versions):
+    """Build a cache version from the change tokens of the given tables; None if any is missing"""
+    version = tuple(versions.get(source) for source in sources)
+    return None if None in version else version
+
+
+def _render_table_expander(session, cfg, versions):
+    """
+    Render one inspector table inside a collapsed expander
+    
+    Args:
+        session: Snowflake session
+        cfg: Table descriptor from TABLES
+        versions: Change tokens from _get_table_versions
+    """
+    with st.expander(cfg["title"], expanded=False):
+        if not _load_requested(cfg["key"]):
+            return
+        if cfg.get("paginate"):
+            st.number_input(f"{cfg['title']} page", min_value=1, value=1, step=1,
+                            key=f"details_page_{cfg['key']}",
+                            help=f"{DETAIL_PAGE_SIZE} rows per page")
+        try:
+            version = _source_version(cfg["sources"], versions)
+            if not cfg["sql"]:
+                df = _load_tasks(session)
+            elif version is not None:
+                df = _load_table(session, _table_sql(cfg), version)
+            else:
+                df = _query_table(session, _table_sql(cfg))
+            
+            if not df.empty:
+                count_label = "Records on Page" if cfg.get("paginate") else cfg.get('count_label', 'Total Records')
+                st.markdown(f"**{count_label}:** {len(df)}")
+                st.dataframe(df, use_container_width=True, hide_index=True)
+            else:
+                st.info(cfg["empty_msg"])
+        except Exception as e:
+            st.error(f"Error loading {cfg['error_label']}: {str(e)}")
+
+
+def render_details_tab(session):
+    """Render the Details tab showing all data_schema tables"""
+    # Refresh button in top right
+    col_title, col_refresh = render_refresh_button("tab5")
+    with col_title:
+        render_section_header("Application Data Inspector", "chart-icon")
+    with col_refresh:
+        if st.button("↻", key="refresh_tab_details", help="Refresh data", type="secondary"):
+            _table_versions.clear()
+            _load_table.clear()
+            _fetch_all_counts.clear()
+            _load_tasks.clear()
+            st.rerun()
     st.markdown("---")
-    render_section_header("Custom SQL Query", "chart-icon")
     
     st.markdown("""
-    Execute custom SQL queries against your Snowflake account. 
-    View results in a table format or see error messages if the query fails.
+    Explore all configuration data collected by the application. View warehouse configurations, 
+    retention policies, active rules, and task execution details. Execute custom SQL queries to analyze your data.
     """)
     
-    # Initialize session state for query results
-    if 'query_result' not in st.session_state:
-        st.session_state.query_result = None
-    if 'query_error' not in st.session_state:
-        st.session_state.query_error = None
-    
-    # SQL Query input
-    query = st.text_area(
-        "Enter your SQL query:",
-        placeholder="SELECT * FROM INFORMATION_SCHEMA.DATABASES LIMIT 10;",
-        height=150,
-        key="sql_query_input"
-    )
+    st.markdown("---")
     
-    # Execute button
-    col1, col2, col3 = st.columns([1, 1, 4])
-    with col1:
-        if st.button("Execute Query", key="execute_query_btn", type="primary"):
-            if query.strip():
-                try:
-                    # Execute the query
-                    result = session.sql(query).collect()
-                    
-                    # Convert to pandas DataFrame for display
-                    if result:
-                        st.session_state.query_result = pd.DataFrame(result)
-                        st.session_state.query_error = None
-                    else:
-                        st.session_state.query_result = pd.DataFrame()
-                        st.session_state.query_error = None
-                        
-                except Exception as e:
-                    st.session_state.query_error = str(e)
-                    st.session_state.query_result = None
-            else:
-                st.session_state.query_error = "Please enter a query to execute."
-                st.session_state.query_result = None
+    # Cheap change tokens decide which cached tables are still current
+    versions = _get_table_versions(session)
     
-    with col2:
-        if st.button("Clear Results", key="clear_results_btn", type="secondary"):
-            st.session_state.query_result = None
-            st.session_state.query_error = None
-            st.rerun()
+    for cfg in TABLES:
+        _render_table_expander(session, cfg, versions)
     
+    # Summary Statistics
     st.markdown("---")
+    render_section_header("Summary Statistics", "chart-icon")
     
-    # Display results or errors
-    if st.session_state.query_error:
-        st.error(f"**Query Error:**\n\n{st.session_state.query_error}")
-    
-    if st.session_state.query_result is not None:
-        if not st.session_state.query_result.empty:
-            st.success(f"Query returned {len(st.session_state.query_result)} rows")
-            
-            # Display dataframe with scrolling
-            st.dataframe(
-                st.session_state.query_result,
-                use_container_width=True,
-                hide_index=True
-            )
-            
-            # Add download button
-            csv = st.session_state.query_result.to_csv(index=False)
-            st.download_button(
-                label="Download Results as CSV",
-                data=csv,
-                file_name="query_results.csv",
-                mime="text/csv",
-                key="download_csv_btn"
-            )
+    try:
+        version = _source_version(_VERSIONED_TABLES, versions)
+        if version is not None:
+            counts = _fetch_all_counts(session, version)
         else:
-            st.info("Query executed successfully but returned no results.")
-    
-    # Add helpful examples
-    with st.expander("Example Queries"):
-        st.markdown("""
-        **List all databases:**
-        ```sql
-        SHOW DATABASES;
-        ```
-        
-        **List all warehouses:**
-        ```sql
-        SHOW WAREHOUSES;
-        ```
-        
-        **View warehouse configurations:**
-        ```sql
-        SELECT * FROM DATA_SCHEMA.WAREHOUSE_DETAILS LIMIT 10;
-        ```
-        
-        **View applied rules:**
-        ```sql
-        SELECT * FROM DATA_SCHEMA.APPLIED_RULES;
-        ```
-        
-        **View database retention policies:**
-        ```sql
-        SELECT * FROM DATA_SCHEMA.DATABASE_RETENTION_DETAILS LIMIT 10;
-        ```
-        """)
+            counts = _query_all_counts(session)
+    except Exception:
+        counts = {}
+    
+    for col, (label, key) in zip(st.columns(len(SUMMARY_LABELS)), SUMMARY_LABELS):
+        col.metric(label, counts.get(key, "Error"))
+    
+    # Custom SQL Query Section
+    st.markdown("---")
+    render_section_header("Custom SQL Query", "chart-icon")
+    
+    render_query_block(session, "details")
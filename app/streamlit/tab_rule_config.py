@@ -3,238 +3,231 @@ Rule Configuration Tab
 Handles the display and management of configuration rules
 """
 
+import collections
 import streamlit as st
 import pandas as pd
-from database import (get_config_rules, get_applied_rules, apply_rule, deactivate_applied_rule, 
-                      get_warehouse_details, get_database_retention_details, get_wh_statement_timeout_default,
-                      get_available_tag_names,get_available_tags, get_applied_tag_rules, apply_tag_rule, deactivate_tag_rule,
-                      get_tag_compliance_details, get_all_objects_by_type, get_whitelisted_violations, run_all_compliance_checks,
+from database import (apply_rule, apply_rules_bulk, deactivate_applied_rule, apply_tag_rule, deactivate_tag_rule,
+                      get_available_tag_names_cached, get_available_tags_cached,
+                      get_applied_tag_rules_cached, get_wh_statement_timeout_default_cached,
+                      run_all_compliance_checks,
                       get_wh_compliance_results, get_db_compliance_results, get_tag_compliance_results,
-                      get_rule_kpi_results, get_tag_rule_kpi_results)
-from compliance import generate_wh_fix_sql, generate_table_fix_sql, generate_tag_fix_sql
-from ui_utils import render_refresh_button, render_section_header, render_rule_card
+                      get_violation_counts_by_rule,
+                      get_config_rules_cached, get_applied_rules_cached, clear_rule_caches, get_connection_key)
+from ui_utils import render_refresh_button, render_section_header, render_rule_card, render_tag_rule_card
 
 
-def render_rule_configuration_tab(session):
-    """Render the Rule Configuration tab"""
-    # Refresh button in top right
-    col_title, col_refresh = render_refresh_button("tab1")
-    with col_title:
-        render_section_header("Rule Configuration", "settings-icon")
-    with col_refresh:
-        if st.button("↻", key="refresh_tab1", help="Refresh data", type="secondary"):
-            st.rerun()
-    st.markdown("---")
+# Columns and labels of the Available Configuration Rules tables
+AVAILABLE_RULE_COLUMNS = [
+    'RULE_NAME', 'CHECK_PARAMETER', 'COMPARISON_OPERATOR', 'UNIT',
+    'DEFAULT_THRESHOLD', 'ALLOW_THRESHOLD_OVERRIDE', 'RULE_DESCRIPTION'
+]
+AVAILABLE_RULE_COLUMN_CONFIG = {
+    'RULE_NAME': st.column_config.TextColumn("Rule"),
+    'CHECK_PARAMETER': st.column_config.TextColumn("Parameter"),
+    'COMPARISON_OPERATOR': st.column_config.TextColumn("Operator"),
+    'UNIT': st.column_config.TextColumn("Unit"),
+    'DEFAULT_THRESHOLD': st.column_config.NumberColumn("Default"),
+    'ALLOW_THRESHOLD_OVERRIDE': st.column_config.CheckboxColumn(
+        "Threshold Editable", help="Unchecked rules always use their default threshold"
+    ),
+    'RULE_DESCRIPTION': st.column_config.TextColumn("Description", width="large"),
+}
+
+
+# Compliance result tables behind the Generate SQL panels, by rule kind
+_COMPLIANCE_TABLES = {
+    'Database': 'database_compliance_results',
+    'Warehouse': 'warehouse_compliance_results',
+    'Tag': 'tag_compliance_results',
+}
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _compliance_versions(_session, conn_key=None):
+    """Fetch a change token for each compliance result table in one round-trip
     
-    # Run Rules button - prominent green button
-    st.html("""
-        <div style="display: flex; justify-content: center; margin: 20px 0;">
-            <div style="text-align: center;">
-                <p style="margin-bottom: 10px; color: #666; font-size: 0.9rem;">
-                    Run compliance checks for all applied rules and save results
-                </p>
-            </div>
-        </div>
-    """)
+    Args:
+        _session: Snowflake session (not hashed by Streamlit)
+        conn_key: Connection identifier from get_connection_key; scopes the entry
     
-    col_left, col_center, col_right = st.columns([1, 2, 1])
-    with col_center:
-        if st.button("▶ Run Rules", key="run_rules_btn", type="primary", use_container_width=True, help="Execute all compliance checks and save results to tables"):
-            with st.spinner("Running compliance checks..."):
-                try:
-                    summary = run_all_compliance_checks(session)
-                    
-                    if summary['success']:
-                        st.success("✓ Compliance checks completed successfully!")
-                        
-                        # Show summary of results
-                        col1, col2, col3 = st.columns(3)
-                        with col1:
-                            st.metric("Warehouses Evaluated", summary['warehouses_evaluated'])
-                        with col2:
-                            st.metric("Database Objects Evaluated", summary['databases_evaluated'])
-                        with col3:
-                            st.metric("Tag Objects Evaluated", summary['tags_evaluated'])
-                        
-                        st.info("Results have been saved to compliance tables. View them in the respective compliance tabs.")
-                    else:
-                        st.error(f"Error running compliance checks: {summary.get('error', 'Unknown error')}")
-                        
-                except Exception as e:
-                    st.error(f"Failed to run compliance checks: {str(e)}")
+    Returns:
+        Dictionary of change tokens keyed by rule kind
+    """
+    columns = ",\n        ".join(
+        f"SYSTEM$LAST_CHANGE_COMMIT_TIME('data_schema.{table}') AS {table}" for table in _COMPLIANCE_TABLES.values()
+    )
+    row = _session.sql(f"SELECT {columns}").collect()[0].as_dict()
+    return {kind: row[table.upper()] for kind, table in _COMPLIANCE_TABLES.items()}
+
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _fix_sql_by_rule(_session, kind, version, default_timeout=None, conn_key=None):
+    """Cached _build_fix_sql_by_rule, keyed on the compliance table's change token
     
-    st.markdown("---")
+    Only called with a real version token; without one the SQL is built uncached.
     
-    # Display available rules in a nicer format
-    st.markdown("#### Available Configuration Rules")
+    Args:
+        _session: Snowflake session (not hashed by Streamlit)
+        kind: 'Database', 'Warehouse' or 'Tag'
+        version: Change token of the compliance table; a new value invalidates the entry
+        default_timeout: Account default statement timeout, used for warehouse resets
+        conn_key: Connection identifier from get_connection_key; scopes the entry
+    """
+    return _build_fix_sql_by_rule(_session, kind, default_timeout)
+
+
+def _build_fix_sql_by_rule(_session, kind, default_timeout=None):
+    """Generate the combined fix SQL for every applied rule of one kind
     
-    rules_df = get_config_rules(session)
-    st.session_state.wh_default_timeout = get_wh_statement_timeout_default(session)
+    Args:
+        _session: Snowflake session
+        kind: 'Database', 'Warehouse' or 'Tag'
+        default_timeout: Account default statement timeout, used for warehouse resets
     
-    if not rules_df.empty:
-        # Create tabs for different rule types
-        tab1, tab2, tab3 = st.tabs(["Database Rules", "Warehouse Rules", "Tag Rules"])
-        
-        # Group rules by type
-        warehouse_rules = rules_df[rules_df['RULE_TYPE'] == 'Warehouse']
-        database_rules = rules_df[rules_df['RULE_TYPE'] == 'Database']
-        
-        # Tab 1: Database Rules
-        with tab1:
-            if not database_rules.empty:
-                for _, rule in database_rules.iterrows():
-                    with st.expander(f"{rule['RULE_NAME']}", expanded=False):
-                        col1, col2, col3, col4 = st.columns(4)
-                        with col1:
-                            st.markdown(f"**Parameter:** `{rule['CHECK_PARAMETER']}`")
-                        with col2:
-                            st.markdown(f"**Operator:** `{rule['COMPARISON_OPERATOR']}`")
-                        with col3:
-                            st.markdown(f"**Unit:** `{rule['UNIT']}`")
-                        with col4:
-                            default_val = rule.get('DEFAULT_THRESHOLD', 'N/A')
-                            st.markdown(f"**Default:** `{default_val}`")
-                        st.markdown(f"**Description:** {rule['RULE_DESCRIPTION']}")
-                        st.html('<span class="db-icon"></span> **Type:** Database')
-                        override_allowed = rule.get('ALLOW_THRESHOLD_OVERRIDE', True)
-                        if not override_allowed:
-                            st.html('<span class="warning-icon"></span> Threshold cannot be changed for this rule')
-            else:
-                st.info("No database rules available")
-        
-        # Tab 2: Warehouse Rules
-        with tab2:
-            if not warehouse_rules.empty:
-                for _, rule in warehouse_rules.iterrows():
-                    with st.expander(f"{rule['RULE_NAME']}", expanded=False):
-                        col1, col2, col3, col4 = st.columns(4)
-                        with col1:
-                            st.markdown(f"**Parameter:** `{rule['CHECK_PARAMETER']}`")
-                        with col2:
-                            st.markdown(f"**Operator:** `{rule['COMPARISON_OPERATOR']}`")
-                        with col3:
-                            st.markdown(f"**Unit:** `{rule['UNIT']}`")
-                        with col4:
-                            default_val = rule.get('DEFAULT_THRESHOLD', 'N/A')
-                            st.markdown(f"**Default:** `{default_val}`")
-                        st.markdown(f"**Description:** {rule['RULE_DESCRIPTION']}")
-                        st.html('<span class="wh-icon"></span> **Type:** Warehouse')
-                        override_allowed = rule.get('ALLOW_THRESHOLD_OVERRIDE', True)
-                        if not override_allowed:
-                            st.html('<span class="warning-icon"></span> Threshold cannot be changed for this rule')
-            else:
-                st.info("No warehouse rules available")
-        
-        # Tab 3: Tag Rules
-        with tab3:
-            st.markdown("**Tag Compliance Rules**")
-            st.markdown("Tag rules check whether required tags are present on objects (warehouses, databases, or tables).")
-            st.markdown("These rules identify missing tags but cannot be automatically fixed - SQL generation is provided for manual execution.")
-            st.markdown("---")
-            
-            # Get available tags from Snowflake
-            try:
-                available_tags_df = get_available_tags(session)
-                if not available_tags_df.empty:
-                    st.markdown(f"**{len(available_tags_df)} tags available in the account**")
-                    with st.expander("View Available Tags"):
-                        for _, tag in available_tags_df.iterrows():
-                            st.markdown(f"- `{tag['TAG_DATABASE']}.{tag['TAG_SCHEMA']}.{tag['TAG_NAME']}`")
-                else:
-                    st.warning("No tags found in SNOWFLAKE.ACCOUNT_USAGE.TAGS")
-            except Exception as e:
-                st.error(f"Error fetching available tags: {str(e)}")
-        
-        st.markdown("---")
-        
-        # Apply new rule in a prominent card
-        st.html('<h4><span class="wh-icon"></span> Apply Configuration Rules</h4>')
+    Returns:
+        Dictionary of combined SQL keyed by applied rule id ((applied tag rule id, object type) for tags)
+    """
+    # Only needed once a Generate SQL panel is opened
+    from compliance import generate_wh_fix_sql, generate_table_fix_sql, generate_tag_fix_sql
+    
+    statements = collections.defaultdict(list)
+    if kind == 'Database':
+        for obj_comp in get_db_compliance_results(_session):
+            for violation in obj_comp['violations']:
+                if not violation.get('is_whitelisted', False):
+                    statements[violation.get('applied_rule_id')].append(generate_table_fix_sql(
+                        obj_comp['database_name'],
+                        obj_comp.get('schema_name'),
+                        obj_comp.get('table_name'),
+                        violation['parameter'],
+                        violation['threshold_value'],
+                        obj_comp['object_type']
+                    ))
+    elif kind == 'Warehouse':
+        for wh_comp in get_wh_compliance_results(_session):
+            for violation in wh_comp['violations']:
+                if not violation.get('is_whitelisted', False):
+                    statements[violation.get('applied_rule_id')].append(generate_wh_fix_sql(
+                        wh_comp['warehouse_name'],
+                        violation['parameter'],
+                        violation['threshold_value'] if violation['threshold_value'] != violation['current_value'] else default_timeout
+                    ))
+    else:
+        for obj_comp in get_tag_compliance_results(_session):
+            for violation in obj_comp['violations']:
+                if not violation.get('is_whitelisted', False):
+                    key = (violation.get('applied_tag_rule_id'), obj_comp['object_type'])
+                    statements[key].append(generate_tag_fix_sql(
+                        obj_comp['object_name'],
+                        obj_comp['object_type'],
+                        violation['tag_name']
+                    ))
+    return {key: "\n\n".join(sql) for key, sql in statements.items()}
+
+
+def _open_sql_panel(state_key, rule_id):
+    """Button callback: mark a rule's Generate SQL panel open before the rerun fetches compliance"""
+    st.session_state.setdefault(state_key, set()).add(rule_id)
+
+
+@st.fragment
+def _render_apply_rule_section(session, rules_df, rules_index):
+    """Render the Apply Configuration Rules form as a fragment
+    
+    Widget changes inside it (rule, threshold, scope, tag pickers) rerun only this section;
+    applying a rule still triggers a full app rerun via st.rerun().
+    
+    Args:
+        session: Snowflake session
+        rules_df: DataFrame of available configuration rules
+        rules_index: Dictionary of rule rows keyed by RULE_ID
+    """
+    # Apply new rule in a prominent card
+    st.html('<h4><span class="wh-icon"></span> Apply Configuration Rules</h4>')
+    
+    # Add rule type selector first
+    rule_type = st.radio(
+        "Select Rule Type",
+        ["Database/Warehouse Rules", "Tag Rules"],
+        horizontal=True,
+        key="rule_type_selector"
+    )
+    
+    st.markdown("---")
+    
+    if rule_type == "Database/Warehouse Rules":
+        # Existing database/warehouse rule application UI
+        # Add "Apply Default Rules" button
+        col_manual, col_default = st.columns([3, 1])
         
-        # Add rule type selector first
-        rule_type = st.radio(
-            "Select Rule Type",
-            ["Database/Warehouse Rules", "Tag Rules"],
-            horizontal=True,
-            key="rule_type_selector"
-        )
+        with col_default:
+            if st.button("Apply Default Rules", type="secondary", use_container_width=True, help="Apply recommended default values for all rules"):
+                try:
+                    # Get default values from config_rules table and apply them in one batch
+                    defaults_df = rules_df[rules_df['DEFAULT_THRESHOLD'].notna()]
+                    default_rules = list(zip(defaults_df['RULE_ID'], defaults_df['DEFAULT_THRESHOLD']))
+                    success_count = apply_rules_bulk(session, default_rules)
+                    
+                    if success_count > 0:
+                        clear_rule_caches()
+                        st.success(f"Successfully applied {success_count} default rules!")
+                        st.rerun()
+                except Exception as e:
+                    st.error(f"Error applying default rules: {str(e)}")
         
-        st.markdown("---")
+        with col_manual:
+            st.markdown("**Or manually configure a rule below:**")
         
-        if rule_type == "Database/Warehouse Rules":
-            # Existing database/warehouse rule application UI
-            # Add "Apply Default Rules" button
-            col_manual, col_default = st.columns([3, 1])
+        with st.container():
+            col1, col2 = st.columns([2, 1])
             
-            with col_default:
-                if st.button("Apply Default Rules", type="secondary", use_container_width=True, help="Apply recommended default values for all rules"):
-                    try:
-                        # Get default values from config_rules table
-                        success_count = 0
-                        for _, rule in rules_df.iterrows():
-                            default_threshold = rule.get('DEFAULT_THRESHOLD')
-                            if default_threshold is not None and not pd.isna(default_threshold):
-                                try:
-                                    apply_rule(session, rule['RULE_ID'], default_threshold, scope='ALL')
-                                    success_count += 1
-                                except Exception as e:
-                                    st.warning(f"Could not apply {rule['RULE_NAME']}: {str(e)}")
-                        
-                        if success_count > 0:
-                            st.success(f"Successfully applied {success_count} default rules!")
-                            st.rerun()
-                    except Exception as e:
-                        st.error(f"Error applying default rules: {str(e)}")
+            with col1:
+                selected_rule = st.selectbox(
+                    "Select Rule to Apply",
+                    rules_df['RULE_ID'].tolist(),
+                    format_func=lambda x: rules_index[x]['RULE_NAME'],
+                    key="rule_selector"
+                )
             
-            with col_manual:
-                st.markdown("**Or manually configure a rule below:**")
+            # Resolve the selected rule once and reuse it below
+            rule_info = rules_index[selected_rule] if selected_rule else None
             
-            with st.container():
-                col1, col2 = st.columns([2, 1])
-                
-                with col1:
-                    selected_rule = st.selectbox(
-                        "Select Rule to Apply",
-                        rules_df['RULE_ID'].tolist(),
-                        format_func=lambda x: f"{rules_df[rules_df['RULE_ID'] == x]['RULE_NAME'].iloc[0]}",
-                        key="rule_selector"
-                    )
-                
-                with col2:
-                    if selected_rule:
-                        rule_info = rules_df[rules_df['RULE_ID'] == selected_rule].iloc[0]
-                        allow_override = rule_info.get('ALLOW_THRESHOLD_OVERRIDE', True)
-                        default_threshold = rule_info.get('DEFAULT_THRESHOLD', 0)
-                        
-                        # Use default threshold as value, and disable if override not allowed
-                        threshold_value = st.number_input(
-                            f"Threshold ({rule_info['UNIT']})",
-                            min_value=0,
-                            value=int(default_threshold) if default_threshold is not None else 0,
-                            step=10,
-                            help=f"Set the {rule_info['COMPARISON_OPERATOR']} value" if allow_override else "This threshold cannot be changed",
-                            disabled=not allow_override
-                        )
-                
+            with col2:
                 if selected_rule:
-                    rule_info = rules_df[rules_df['RULE_ID'] == selected_rule].iloc[0]
-                    st.info(f"**{rule_info['RULE_NAME']}**: {rule_info['RULE_DESCRIPTION']}")
+                    allow_override = rule_info.get('ALLOW_THRESHOLD_OVERRIDE', True)
+                    default_threshold = rule_info.get('DEFAULT_THRESHOLD', 0)
                     
-                    # Add scope selection
-                    st.markdown("##### Rule Scope")
-                    scope = st.radio(
-                        "Apply this rule to:",
-                        ["All Objects", "Objects with Specific Tag"],
-                        horizontal=True,
-                        key="rule_scope_selector",
-                        help="Choose whether this rule applies to all objects or only objects with a specific tag"
+                    # Use default threshold as value, and disable if override not allowed
+                    threshold_value = st.number_input(
+                        f"Threshold ({rule_info['UNIT']})",
+                        min_value=0,
+                        value=int(default_threshold) if default_threshold is not None else 0,
+                        step=10,
+                        help=f"Set the {rule_info['COMPARISON_OPERATOR']} value" if allow_override else "This threshold cannot be changed",
+                        disabled=not allow_override
                     )
-                    
+            
+            if selected_rule:
+                st.info(f"**{rule_info['RULE_NAME']}**: {rule_info['RULE_DESCRIPTION']}")
+                
+                # Add scope selection
+                st.markdown("##### Rule Scope")
+                scope = st.radio(
+                    "Apply this rule to:",
+                    ["All Objects", "Objects with Specific Tag"],
+                    horizontal=True,
+                    key="rule_scope_selector",
+                    help="Choose whether this rule applies to all objects or only objects with a specific tag"
+                )
+                
+                # Tag pickers and Apply are submitted together, so typing a tag value does not rerun the section
+                with st.form("apply_rule_form", border=False):
                     # Tag selection (only if TAG_BASED scope)
                     tag_name = None
                     tag_value = None
                     if scope == "Objects with Specific Tag":
                         try:
-                            available_tags_df = get_available_tag_names(session)
+                            available_tags_df = get_available_tag_names_cached(session, get_connection_key(session))
                             if not available_tags_df.empty:
                                 col_tag1, col_tag2 = st.columns([1, 1])
                                 with col_tag1:
@@ -257,16 +250,17 @@ def render_rule_configuration_tab(session):
                                 st.warning("No tags available in the account. Create tags first to use tag-based rules.")
                         except Exception as e:
                             st.error(f"Error loading tags: {str(e)}")
-                    
+                
                     # Convert scope to internal format
                     scope_internal = 'ALL' if scope == "All Objects" else 'TAG_BASED'
-                    
+                
                     col1, col2, col3 = st.columns([1, 1, 2])
                     with col1:
-                        if st.button("Apply Rule", type="primary", use_container_width=True):
+                        if st.form_submit_button("Apply Rule", type="primary", use_container_width=True):
                             try:
                                 apply_rule(session, selected_rule, threshold_value, scope_internal, tag_name, tag_value)
-                                
+                                clear_rule_caches()
+                            
                                 # Generate success message based on scope
                                 if scope_internal == 'TAG_BASED':
                                     tag_desc = f"Tag: {tag_name}={tag_value}" if tag_value else f"Tag: {tag_name}"
@@ -276,304 +270,347 @@ def render_rule_configuration_tab(session):
                                 st.rerun()
                             except Exception as e:
                                 st.error(f"Error applying rule: {str(e)}")
+    
+    else:  # Tag Rules
+        st.markdown("**Configure Tag Compliance Rule**")
+        st.info("Tag rules check whether required tags are present on objects. Select a tag and object type to enforce tag compliance.")
         
-        else:  # Tag Rules
-            st.markdown("**Configure Tag Compliance Rule**")
-            st.info("Tag rules check whether required tags are present on objects. Select a tag and object type to enforce tag compliance.")
-            
-            # Get available tag names
-            try:
-                available_tags_df = get_available_tags(session)
-                if available_tags_df.empty:
-                    st.warning("No tags available. Please create tags in your Snowflake account first.")
-                else:
-                    # Tag selection and object type selection
-                    col1, col2 = st.columns(2)
+        # Get available tag names
+        try:
+            available_tags_df = get_available_tags_cached(session, get_connection_key(session))
+            if available_tags_df.empty:
+                st.warning("No tags available. Please create tags in your Snowflake account first.")
+            else:
+                # Tag selection and object type selection
+                col1, col2 = st.columns(2)
+                
+                with col1:
+                    selected_tag = st.selectbox(
+                        "Select Tag",
+                        available_tags_df['FULL_TAG_NAME'].tolist(),
+                        key="tag_selector"
+                    )
+                
+                with col2:
+                    selected_object_type = st.selectbox(
+                        "Select Object Type",
+                        ["WAREHOUSE", "DATABASE", "TABLE"],
+                        key="tag_object_type_selector"
+                    )
+                
+                if selected_tag and selected_object_type:
+                    st.info(f"This rule will ensure all {selected_object_type}s have the tag `{selected_tag}` assigned.")
                     
+                    col1, col2, col3 = st.columns([1, 1, 2])
                     with col1:
-                        # Create list of full tag names
-                        tag_options = [f"{row['TAG_DATABASE']}.{row['TAG_SCHEMA']}.{row['TAG_NAME']}" 
-                                       for _, row in available_tags_df.iterrows()]
-                        selected_tag = st.selectbox(
-                            "Select Tag",
-                            tag_options,
-                            key="tag_selector"
-                        )
-                    
-                    with col2:
-                        selected_object_type = st.selectbox(
-                            "Select Object Type",
-                            ["WAREHOUSE", "DATABASE", "TABLE"],
-                            key="tag_object_type_selector"
-                        )
-                    
-                    if selected_tag and selected_object_type:
-                        st.info(f"This rule will ensure all {selected_object_type}s have the tag `{selected_tag}` assigned.")
-                        
-                        col1, col2, col3 = st.columns([1, 1, 2])
-                        with col1:
-                            if st.button("Apply Tag Rule", type="primary", use_container_width=True):
-                                try:
-                                    apply_tag_rule(session, selected_tag, selected_object_type)
-                                    st.success(f"Tag rule applied: '{selected_tag}' required on all {selected_object_type}s")
-                                    st.rerun()
-                                except ValueError as e:
-                                    st.error(str(e))
-                                except Exception as e:
-                                    st.error(f"Error applying tag rule: {str(e)}")
-            except Exception as e:
-                st.error(f"Error loading tags: {str(e)}")
-    else:
-        st.warning("No configuration rules available")
+                        if st.button("Apply Tag Rule", type="primary", use_container_width=True):
+                            try:
+                                apply_tag_rule(session, selected_tag, selected_object_type)
+                                clear_rule_caches()
+                                st.success(f"Tag rule applied: '{selected_tag}' required on all {selected_object_type}s")
+                                st.rerun()
+                            except ValueError as e:
+                                st.error(str(e))
+                            except Exception as e:
+                                st.error(f"Error applying tag rule: {str(e)}")
+        except Exception as e:
+            st.error(f"Error loading tags: {str(e)}")
+
+
+@st.fragment
+def _render_applied_rules_section(session):
+    """Render the Currently Applied Rules section as a fragment
     
-    st.markdown("---")
+    The applied rule lists are read from their caches here rather than passed in, so
+    Generate SQL toggles rerun only this section with fresh data; deactivations still
+    trigger a full app rerun so the compliance tabs drop the rule too.
+    
+    Args:
+        session: Snowflake session
+    """
+    conn_key = get_connection_key(session)
+    applied_rules_df = get_applied_rules_cached(session, conn_key)
+    applied_tag_rules_df = get_applied_tag_rules_cached(session, conn_key)
     
     # Display applied rules
     st.markdown("#### Currently Applied Rules")
-    applied_rules_df = get_applied_rules(session)
-    applied_tag_rules_df = get_applied_tag_rules(session)
+    
+    # Nothing applied yet: skip the KPI and compliance fetches entirely
+    if applied_rules_df.empty and applied_tag_rules_df.empty:
+        st.info("No rules have been applied yet. Apply a rule above to start monitoring compliance.")
+        return
+    
+    # Get violation counts for all rules and tag rules in one query
     try:
-        tag_df = get_tag_compliance_details(session)
+        counts_df = get_violation_counts_by_rule(session)
     except:
-        tag_df = pd.DataFrame()
+        counts_df = pd.DataFrame()
     
-    # Create tabs for different rule types
-    if not applied_rules_df.empty or not applied_tag_rules_df.empty:
-        # Get KPI data once for all rules
+    # Index violation counts by applied rule id once instead of masking per rule
+    counts_by_kind = {
+        kind: dict(zip(group['APPLIED_ID'], group['VIOLATION_COUNT']))
+        for kind, group in counts_df.groupby('RULE_KIND', sort=False)
+    } if not counts_df.empty else {}
+    rule_violation_counts = counts_by_kind.get('RULE', {})
+    tag_rule_violation_counts = counts_by_kind.get('TAG', {})
+
+    # Applied rule ids whose Generate SQL panel is open, one set per rule kind
+    open_rule_sql = st.session_state.setdefault('open_rule_sql', set())
+    open_tag_rule_sql = st.session_state.setdefault('open_tag_rule_sql', set())
+    open_rule_types = set(
+        applied_rules_df.loc[applied_rules_df['APPLIED_RULE_ID'].isin(open_rule_sql), 'RULE_TYPE']
+    ) if open_rule_sql and not applied_rules_df.empty else set()
+    tag_sql_open = not applied_tag_rules_df.empty and applied_tag_rules_df['APPLIED_TAG_RULE_ID'].isin(open_tag_rule_sql).any()
+    
+    # Fix SQL for the open panels is cached per compliance table version, so it is only
+    # regenerated after Run Rules rewrites the results
+    open_kinds = [kind for kind in _COMPLIANCE_TABLES if kind in open_rule_types or (kind == 'Tag' and tag_sql_open)]
+    if open_kinds:
         try:
-            rule_kpi_df = get_rule_kpi_results(session)
-            tag_rule_kpi_df = get_tag_rule_kpi_results(session)
-        except:
-            rule_kpi_df = pd.DataFrame()
-            tag_rule_kpi_df = pd.DataFrame()
-        
-        tab1, tab2, tab3 = st.tabs(["Database Rules", "Warehouse Rules", "Tag Rules"])
-        
-        # Tab 1: Database Rules
-        with tab1:
-            db_rules = applied_rules_df[applied_rules_df['RULE_TYPE'] == 'Database'] if not applied_rules_df.empty else pd.DataFrame()
+            versions = _compliance_versions(session, conn_key)
+        except Exception:
+            # Without a change token the fix SQL is built uncached below
+            versions = {}
+        # Dropped by a deactivation that reran only this fragment
+        if 'wh_default_timeout' not in st.session_state:
+            st.session_state.wh_default_timeout = get_wh_statement_timeout_default_cached(session, conn_key)
+        default_timeout = st.session_state.wh_default_timeout
+        fix_sql = {
+            kind: _fix_sql_by_rule(session, kind, versions[kind], default_timeout, conn_key)
+            if versions.get(kind) is not None else _build_fix_sql_by_rule(session, kind, default_timeout)
+            for kind in open_kinds
+        }
+    else:
+        fix_sql = {}
+    db_fix_sql = fix_sql.get('Database', {})
+    wh_fix_sql = fix_sql.get('Warehouse', {})
+    tag_fix_sql = fix_sql.get('Tag', {})
+
+    # Split applied rules by type in one pass
+    applied_groups = dict(list(applied_rules_df.groupby('RULE_TYPE', sort=False))) if not applied_rules_df.empty else {}
+    
+    tab1, tab2, tab3 = st.tabs(["Database Rules", "Warehouse Rules", "Tag Rules"])
+    
+    # Tabs 1-2: Database and Warehouse Rules share one layout
+    for rule_tab, rule_type, rule_type_class, type_fix_sql, compliant_msg in (
+        (tab1, 'Database', 'database', db_fix_sql, "All objects are compliant with this rule"),
+        (tab2, 'Warehouse', 'warehouse', wh_fix_sql, "All warehouses are compliant with this rule"),
+    ):
+        rule_type_icon = f'<span class="{"db" if rule_type == "Database" else "wh"}-icon"></span>'
+        with rule_tab:
+            type_rules = applied_groups.get(rule_type, pd.DataFrame())
             
-            if not db_rules.empty:
-                for _, rule in db_rules.iterrows():
-                    rule_type_class = "database"
-                    rule_type_icon = '<span class="db-icon"></span>'
-                    
+            if not type_rules.empty:
+                for i, rule in enumerate(type_rules.itertuples(index=False)):
                     # Get violation count from KPI table
-                    violation_count = 0
-                    if not rule_kpi_df.empty:
-                        kpi_row = rule_kpi_df[rule_kpi_df['APPLIED_RULE_ID'] == rule['APPLIED_RULE_ID']]
-                        if not kpi_row.empty:
-                            violation_count = int(kpi_row.iloc[0]['TOTAL_VIOLATIONS'])
+                    violation_count = int(rule_violation_counts.get(rule.APPLIED_RULE_ID, 0))
                     
                     # Render the rule card using utility function with violation count
-                    render_rule_card(rule, rule_type_class, rule_type_icon, violation_count)
+                    render_rule_card(rule, rule_type_class, rule_type_icon, violation_count, leading_divider=i > 0)
                     
-                    # Determine column layout based on has_fix_sql
-                    has_fix_sql = rule.get('HAS_FIX_SQL', False)
-                    
-                    if has_fix_sql:
-                        col1, col2, col3 = st.columns([3, 1, 1])
-                    else:
-                        col1, col2 = st.columns([4, 1])
+                    # Same column layout for every row; col2 stays empty when the rule has no fix SQL
+                    has_fix_sql = getattr(rule, 'HAS_FIX_SQL', False)
+                    col1, col2, col3 = st.columns([3, 1, 1])
                     
                     # Show Generate SQL button only if has_fix_sql is True
                     if has_fix_sql:
                         with col2:
-                            if st.button("Generate SQL", key=f"btn_sql_{rule['APPLIED_RULE_ID']}", help="Generate SQL for all non-compliant objects", use_container_width=True):
-                                st.session_state[f'show_sql_{rule["APPLIED_RULE_ID"]}'] = True
+                            st.button("Generate SQL", key=f"btn_sql_{rule.APPLIED_RULE_ID}", help="Generate SQL for all non-compliant objects", use_container_width=True,
+                                      on_click=_open_sql_panel, args=('open_rule_sql', rule.APPLIED_RULE_ID))
                     
-                    # Deactivate button position depends on whether SQL button exists
-                    with col3 if has_fix_sql else col2:
-                        if st.button("Deactivate", key=f"deact_{rule['APPLIED_RULE_ID']}", help="Stop monitoring this rule", type="primary", use_container_width=True):
+                    with col3:
+                        if st.button("Deactivate", key=f"deact_{rule.APPLIED_RULE_ID}", help="Stop monitoring this rule", type="primary", use_container_width=True):
                             try:
-                                deactivate_applied_rule(session, rule['APPLIED_RULE_ID'])
+                                deactivate_applied_rule(session, rule.APPLIED_RULE_ID)
+                                # Only the applied rules and the timeout default derived from them change
+                                get_applied_rules_cached.clear()
+                                get_wh_statement_timeout_default_cached.clear()
+                                st.session_state.pop('wh_default_timeout', None)
+                                open_rule_sql.discard(rule.APPLIED_RULE_ID)
                                 st.success("Rule deactivated")
+                                # Full rerun: the compliance tabs read the applied rules on a full run
                                 st.rerun()
                             except Exception as e:
                                 st.error(f"Error: {str(e)}")
                     
-                    # Show SQL if button was clicked
-                    if st.session_state.get(f'show_sql_{rule["APPLIED_RULE_ID"]}', False):
-                        # Generate SQL for database/schema/table rules - only for this specific applied rule
-                        # Get compliance data from database
-                        all_compliance_data = get_db_compliance_results(session)
+                    # Show the generated SQL for this specific applied rule if the panel is open
+                    if rule.APPLIED_RULE_ID in open_rule_sql:
+                        combined_sql = type_fix_sql.get(rule.APPLIED_RULE_ID)
                         
-                        sql_statements = []
-                        for obj_comp in all_compliance_data:
-                            for violation in obj_comp['violations']:
-                                if violation.get('applied_rule_id') == rule['APPLIED_RULE_ID'] and not violation.get('is_whitelisted', False):
-                                    sql = generate_table_fix_sql(
-                                        obj_comp['database_name'],
-                                        obj_comp.get('schema_name'),
-                                        obj_comp.get('table_name'),
-                                        violation['parameter'],
-                                        violation['threshold_value'],
-                                        obj_comp['object_type']
-                                    )
-                                    sql_statements.append(sql)
-                        
-                        if sql_statements:
-                            combined_sql = "\n\n".join(sql_statements)
+                        if combined_sql:
                             st.code(combined_sql, language="sql")
                         else:
-                            st.success("All objects are compliant with this rule")
-                    
-                    st.markdown("---")
+                            st.success(compliant_msg)
+                
+                st.markdown("---")
             else:
-                st.info("No database rules have been applied yet")
-        
-        # Tab 2: Warehouse Rules
-        with tab2:
-            wh_rules = applied_rules_df[applied_rules_df['RULE_TYPE'] == 'Warehouse'] if not applied_rules_df.empty else pd.DataFrame()
-            
-            if not wh_rules.empty:
-                for _, rule in wh_rules.iterrows():
-                    rule_type_class = "warehouse"
-                    rule_type_icon = '<span class="wh-icon"></span>'
-                    
-                    # Get violation count from KPI table
-                    violation_count = 0
-                    if not rule_kpi_df.empty:
-                        kpi_row = rule_kpi_df[rule_kpi_df['APPLIED_RULE_ID'] == rule['APPLIED_RULE_ID']]
-                        if not kpi_row.empty:
-                            violation_count = int(kpi_row.iloc[0]['TOTAL_VIOLATIONS'])
-                    
-                    # Render the rule card using utility function with violation count
-                    render_rule_card(rule, rule_type_class, rule_type_icon, violation_count)
-                    
-                    # Determine column layout based on has_fix_sql
-                    has_fix_sql = rule.get('HAS_FIX_SQL', False)
+                st.info(f"No {rule_type.lower()} rules have been applied yet")
+    
+    # Tab 3: Tag Rules
+    with tab3:
+        if not applied_tag_rules_df.empty:
+            for i, tag_rule in enumerate(applied_tag_rules_df.itertuples(index=False)):
+                # Get violation count from KPI table
+                violation_count = int(tag_rule_violation_counts.get(tag_rule.APPLIED_TAG_RULE_ID, 0))
+                
+                # Display tag rule card, carrying the divider from the previous rule
+                render_tag_rule_card(tag_rule, violation_count, leading_divider=i > 0)
+                
+                col1, col2, col3 = st.columns([3, 1, 1])
+                
+                with col2:
+                    st.button("Generate SQL", key=f"btn_tag_sql_{tag_rule.APPLIED_TAG_RULE_ID}", help="Generate SQL for all non-compliant objects", use_container_width=True,
+                              on_click=_open_sql_panel, args=('open_tag_rule_sql', tag_rule.APPLIED_TAG_RULE_ID))
+                
+                with col3:
+                    if st.button("Deactivate", key=f"deact_tag_{tag_rule.APPLIED_TAG_RULE_ID}", help="Stop monitoring this tag rule", type="primary", use_container_width=True):
+                        try:
+                            deactivate_tag_rule(session, tag_rule.APPLIED_TAG_RULE_ID)
+                            get_applied_tag_rules_cached.clear()
+                            open_tag_rule_sql.discard(tag_rule.APPLIED_TAG_RULE_ID)
+                            st.success("Tag rule deactivated")
+                            # Full rerun: the tag compliance tab reads the applied tag rules on a full run
+                            st.rerun()
+                        except Exception as e:
+                            st.error(f"Error: {str(e)}")
+                
+                # Show SQL if button was clicked
+                if tag_rule.APPLIED_TAG_RULE_ID in open_tag_rule_sql:
+                    # Only objects of this tag rule's object type
+                    combined_sql = tag_fix_sql.get((tag_rule.APPLIED_TAG_RULE_ID, tag_rule.OBJECT_TYPE))
                     
-                    if has_fix_sql:
-                        col1, col2, col3 = st.columns([3, 1, 1])
+                    if combined_sql:
+                        st.code(combined_sql, language="sql")
                     else:
-                        col1, col2 = st.columns([4, 1])
+                        st.success(f"All {tag_rule.OBJECT_TYPE}s are compliant with this tag rule")
+            
+            st.markdown("---")
+        else:
+            st.info("No tag rules have been applied yet")
+
+
+def render_rule_configuration_tab(session):
+    """Render the Rule Configuration tab"""
+    # Refresh button in top right
+    col_title, col_refresh = render_refresh_button("tab1")
+    with col_title:
+        render_section_header("Rule Configuration", "settings-icon")
+    with col_refresh:
+        if st.button("↻", key="refresh_tab1", help="Refresh data", type="secondary"):
+            clear_rule_caches()
+            get_available_tags_cached.clear()
+            get_available_tag_names_cached.clear()
+            _compliance_versions.clear()
+            _fix_sql_by_rule.clear()
+            st.rerun()
+    st.markdown("---")
+    
+    # Run Rules button - prominent green button
+    st.html("""
+        <div style="display: flex; justify-content: center; margin: 20px 0;">
+            <div style="text-align: center;">
+                <p style="margin-bottom: 10px; color: #666; font-size: 0.9rem;">
+                    Run compliance checks for all applied rules and save results
+                </p>
+            </div>
+        </div>
+    """)
+    
+    col_left, col_center, col_right = st.columns([1, 2, 1])
+    with col_center:
+        if st.button("▶ Run Rules", key="run_rules_btn", type="primary", use_container_width=True, help="Execute all compliance checks and save results to tables"):
+            with st.spinner("Running compliance checks..."):
+                try:
+                    summary = run_all_compliance_checks(session)
+                    st.session_state.pop('db_last_page', None)
+                    st.session_state.pop('tag_last_page', None)
+                    st.session_state.tag_cache_gen = st.session_state.get('tag_cache_gen', 0) + 1
+                    _compliance_versions.clear()
+                    _fix_sql_by_rule.clear()
                     
-                    # Show Generate SQL button only if has_fix_sql is True
-                    if has_fix_sql:
+                    if summary['success']:
+                        st.success("✓ Compliance checks completed successfully!")
+                        
+                        # Show summary of results
+                        col1, col2, col3 = st.columns(3)
+                        with col1:
+                            st.metric("Warehouses Evaluated", summary['warehouses_evaluated'])
                         with col2:
-                            if st.button("Generate SQL", key=f"btn_sql_{rule['APPLIED_RULE_ID']}", help="Generate SQL for all non-compliant objects", use_container_width=True):
-                                st.session_state[f'show_sql_{rule["APPLIED_RULE_ID"]}'] = True
-                    
-                    # Deactivate button position depends on whether SQL button exists
-                    with col3 if has_fix_sql else col2:
-                        if st.button("Deactivate", key=f"deact_{rule['APPLIED_RULE_ID']}", help="Stop monitoring this rule", type="primary", use_container_width=True):
-                            try:
-                                deactivate_applied_rule(session, rule['APPLIED_RULE_ID'])
-                                st.success("Rule deactivated")
-                                st.rerun()
-                            except Exception as e:
-                                st.error(f"Error: {str(e)}")
-                    
-                    # Show SQL if button was clicked
-                    if st.session_state.get(f'show_sql_{rule["APPLIED_RULE_ID"]}', False):
-                        # Generate SQL for warehouse rules - only for this specific applied rule
-                        # Get compliance data from database
-                        all_compliance_data = get_wh_compliance_results(session)
+                            st.metric("Database Objects Evaluated", summary['databases_evaluated'])
+                        with col3:
+                            st.metric("Tag Objects Evaluated", summary['tags_evaluated'])
                         
-                        sql_statements = []
-                        for wh_comp in all_compliance_data:
-                            for violation in wh_comp['violations']:
-                                if violation.get('applied_rule_id') == rule['APPLIED_RULE_ID'] and not violation.get('is_whitelisted', False):
-                                    sql = generate_wh_fix_sql(
-                                        wh_comp['warehouse_name'],
-                                        violation['parameter'],
-                                        violation['threshold_value'] if violation['threshold_value'] != violation['current_value'] else st.session_state.wh_default_timeout
-                                    )
-                                    sql_statements.append(sql)
+                        st.info("Results have been saved to compliance tables. View them in the respective compliance tabs.")
+                    else:
+                        st.error(f"Error running compliance checks: {summary.get('error', 'Unknown error')}")
                         
-                        if sql_statements:
-                            combined_sql = "\n\n".join(sql_statements)
-                            st.code(combined_sql, language="sql")
-                        else:
-                            st.success("All warehouses are compliant with this rule")
-                    
-                    st.markdown("---")
-            else:
-                st.info("No warehouse rules have been applied yet")
+                except Exception as e:
+                    st.error(f"Failed to run compliance checks: {str(e)}")
+    
+    st.markdown("---")
+    
+    # Display available rules in a nicer format
+    st.markdown("#### Available Configuration Rules")
+    
+    # Fetched sequentially: the Snowpark session is not guaranteed to be thread-safe in
+    # Streamlit in Snowflake. The default statement timeout is loaded once per session and
+    # the applied rule lists are read from cache by the applied rules fragment.
+    conn_key = get_connection_key(session)
+    rules_df = get_config_rules_cached(session, conn_key)
+    if 'wh_default_timeout' not in st.session_state:
+        st.session_state.wh_default_timeout = get_wh_statement_timeout_default_cached(session, conn_key)
+    # O(1) rule lookups by RULE_ID for the selectors below
+    rules_index = rules_df.set_index('RULE_ID', drop=False).to_dict('index')
+    
+    if not rules_df.empty:
+        # Create tabs for different rule types
+        tab1, tab2, tab3 = st.tabs(["Database Rules", "Warehouse Rules", "Tag Rules"])
+        
+        # Group rules by type
+        rule_groups = dict(list(rules_df.groupby('RULE_TYPE', sort=False)))
+        
+        # Tabs 1-2: Database and Warehouse Rules, one table per type
+        for rule_tab, rule_type in ((tab1, 'Database'), (tab2, 'Warehouse')):
+            with rule_tab:
+                type_rules = rule_groups.get(rule_type, rules_df.iloc[0:0])
+                if not type_rules.empty:
+                    st.dataframe(
+                        type_rules[AVAILABLE_RULE_COLUMNS],
+                        hide_index=True,
+                        use_container_width=True,
+                        column_config=AVAILABLE_RULE_COLUMN_CONFIG
+                    )
+                else:
+                    st.info(f"No {rule_type.lower()} rules available")
         
         # Tab 3: Tag Rules
         with tab3:
-            if not applied_tag_rules_df.empty:
-                for _, tag_rule in applied_tag_rules_df.iterrows():
-                    # Get violation count from KPI table
-                    violation_count = 0
-                    if not tag_rule_kpi_df.empty:
-                        kpi_row = tag_rule_kpi_df[tag_rule_kpi_df['APPLIED_TAG_RULE_ID'] == tag_rule['APPLIED_TAG_RULE_ID']]
-                        if not kpi_row.empty:
-                            violation_count = int(kpi_row.iloc[0]['TOTAL_VIOLATIONS'])
-                    
-                    # Build violation count display
-                    violation_html = ""
-                    if violation_count > 0:
-                        violation_html = f'<span class="violation-count"><span class="warning-icon"></span> {violation_count} violation{"s" if violation_count != 1 else ""}</span>'
-                    else:
-                        violation_html = '<span class="compliant-count"><span class="check-icon"></span> All compliant</span>'
-                    
-                    # Display tag rule card
-                    st.html(f"""
-                        <div class="rule-card tag">
-                            <h4 style="margin-top:0;">
-                                <span class="tag-icon"></span> Tag: {tag_rule['TAG_NAME']}
-                                <span class="rule-type-label tag">TAG RULE</span>
-                                {violation_html}
-                            </h4>
-                            <p style="margin-bottom:0.5rem;">
-                                <strong>Object Type:</strong> {tag_rule['OBJECT_TYPE']} | 
-                                <strong>Applied:</strong> {tag_rule['APPLIED_AT'].strftime('%Y-%m-%d %H:%M')} | 
-                                <strong>Applied By:</strong> {tag_rule.get('APPLIED_BY', 'N/A')}
-                            </p>
-                        </div>
-                    """)
-                    
-                    col1, col2, col3 = st.columns([3, 1, 1])
-                    
-                    with col2:
-                        if st.button("Generate SQL", key=f"btn_tag_sql_{tag_rule['APPLIED_TAG_RULE_ID']}", help="Generate SQL for all non-compliant objects", use_container_width=True):
-                            st.session_state[f'show_tag_sql_{tag_rule["APPLIED_TAG_RULE_ID"]}'] = True
-                    
-                    with col3:
-                        if st.button("Deactivate", key=f"deact_tag_{tag_rule['APPLIED_TAG_RULE_ID']}", help="Stop monitoring this tag rule", type="primary", use_container_width=True):
-                            try:
-                                deactivate_tag_rule(session, tag_rule['APPLIED_TAG_RULE_ID'])
-                                st.success("Tag rule deactivated")
-                                st.rerun()
-                            except Exception as e:
-                                st.error(f"Error: {str(e)}")
-                    
-                    # Show SQL if button was clicked
-                    if st.session_state.get(f'show_tag_sql_{tag_rule["APPLIED_TAG_RULE_ID"]}', False):
-                        # Get compliance data from database for this specific tag rule
-                        all_tag_compliance = get_tag_compliance_results(session)
-                        
-                        # Filter for the specific object type of this tag rule
-                        relevant_compliance = [
-                            obj for obj in all_tag_compliance 
-                            if obj['object_type'] == tag_rule['OBJECT_TYPE']
-                        ]
-                        
-                        sql_statements = []
-                        for obj_comp in relevant_compliance:
-                            if obj_comp['violations']:
-                                for violation in obj_comp['violations']:
-                                    # Skip whitelisted violations and only process violations for this specific tag rule
-                                    if (not violation.get('is_whitelisted', False) and 
-                                        violation.get('applied_tag_rule_id') == tag_rule['APPLIED_TAG_RULE_ID']):
-                                        sql = generate_tag_fix_sql(
-                                            obj_comp['object_name'],
-                                            obj_comp['object_type'],
-                                            violation['tag_name']
-                                        )
-                                        sql_statements.append(sql)
-                        
-                        if sql_statements:
-                            combined_sql = "\n\n".join(sql_statements)
-                            st.code(combined_sql, language="sql")
-                        else:
-                            st.success(f"All {tag_rule['OBJECT_TYPE']}s are compliant with this tag rule")
-                    
-                    st.markdown("---")
-            else:
-                st.info("No tag rules have been applied yet")
+            st.markdown(
+                "**Tag Compliance Rules**\n\n"
+                "Tag rules check whether required tags are present on objects (warehouses, databases, or tables).\n\n"
+                "These rules identify missing tags but cannot be automatically fixed - SQL generation is provided for manual execution.\n\n"
+                "---"
+            )
+            
+            # Get available tags from Snowflake
+            try:
+                available_tags_df = get_available_tags_cached(session, get_connection_key(session))
+                if not available_tags_df.empty:
+                    st.markdown(f"**{len(available_tags_df)} tags available in the account**")
+                    with st.expander("View Available Tags"):
+                        # One markdown block for the whole list instead of one element per tag
+                        st.markdown("\n".join(f"- `{full_tag_name}`" for full_tag_name in available_tags_df['FULL_TAG_NAME']))
+                else:
+                    st.warning("No tags found in SNOWFLAKE.ACCOUNT_USAGE.TAGS")
+            except Exception as e:
+                st.error(f"Error fetching available tags: {str(e)}")
+        
+        st.markdown("---")
+        
+        _render_apply_rule_section(session, rules_df, rules_index)
     else:
-        st.info("No rules have been applied yet. Apply a rule above to start monitoring compliance.")
+        st.warning("No configuration rules available")
+    
+    st.markdown("---")
+    
+    _render_applied_rules_section(session)
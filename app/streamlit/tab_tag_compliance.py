@@ -5,11 +5,28 @@ Handles the display of tag compliance status for warehouses, databases, and tabl
 
 import streamlit as st
 import pandas as pd
-from database import (get_applied_tag_rules, get_tag_compliance_details, get_all_objects_by_type, 
-                      get_whitelisted_violations, add_to_whitelist, 
+from database import (get_applied_tag_rules_cached, get_connection_key, add_to_whitelist, clear_whitelist_caches,
                       get_tag_compliance_results_paginated, get_tag_compliance_metrics)
 from compliance import generate_tag_fix_sql
-from ui_utils import render_refresh_button, render_section_header, render_filter_button, render_pagination_controls
+from ui_utils import render_refresh_button, render_section_header, render_filter_button, render_pagination_controls, split_violations
+
+
+OBJECT_TYPES = ("WAREHOUSE", "DATABASE", "TABLE")
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _tag_metrics_cached(_session, object_type, generation=0, conn_key=None):
+    """Cached get_tag_compliance_metrics for one object type
+    
+    The counts do not depend on the selected filter, so filter clicks reuse the entry.
+    
+    Args:
+        _session: Snowflake session (not hashed by Streamlit)
+        object_type: 'WAREHOUSE', 'DATABASE' or 'TABLE'
+        generation: st.session_state.tag_cache_gen; bumped after results or whitelists change
+        conn_key: Connection identifier from get_connection_key; scopes the entry
+    """
+    return get_tag_compliance_metrics(_session, object_type)
 
 
 def render_tag_compliance_tab(session):
@@ -34,24 +51,29 @@ def render_tag_compliance_tab(session):
         render_section_header("Tag Compliance", "tag-icon")
     with col_refresh:
         if st.button("↻", key="refresh_tab_tag_compliance", help="Refresh data", type="secondary"):
+            st.session_state.pop('tag_last_page', None)
+            st.session_state.tag_cache_gen = st.session_state.get('tag_cache_gen', 0) + 1
             st.rerun()
     st.markdown("---")
     
     # Get applied tag rules
-    tag_rules_df = get_applied_tag_rules(session)
+    tag_rules_df = get_applied_tag_rules_cached(session, get_connection_key(session))
     
     if tag_rules_df.empty:
         st.info("No tag rules have been applied yet. Go to the Rule Configuration tab to apply tag rules.")
         return
     
+    object_type_filter = st.session_state.tag_object_type_filter
+    
     # Get metrics from database
     try:
-        metrics = get_tag_compliance_metrics(session, st.session_state.tag_object_type_filter, st.session_state.tag_compliance_filter.lower())
+        metrics = _tag_metrics_cached(session, object_type_filter,
+                                      st.session_state.get('tag_cache_gen', 0), get_connection_key(session))
     except:
         metrics = {'total': 0, 'violations': 0, 'compliant': 0, 'whitelisted': 0, 'compliance_rate': 0}
     
     if metrics['total'] == 0:
-        st.warning(f"No compliance data available for {st.session_state.tag_object_type_filter}s. Click 'Run Rules' in the Rule Configuration tab to generate compliance results.")
+        st.warning(f"No compliance data available for {object_type_filter}s. Click 'Run Rules' in the Rule Configuration tab to generate compliance results.")
         return
     
     # Display summary metrics
@@ -74,33 +96,108 @@ def render_tag_compliance_tab(session):
     
     st.html("<br>")
     
-    # Object type selection and search
-    col1, col2, col3 = st.columns([1, 3, 1])
-    with col1:
-        object_type_input = st.selectbox(
-            "Select Object Type",
-            ["WAREHOUSE", "DATABASE", "TABLE"],
-            index=["WAREHOUSE", "DATABASE", "TABLE"].index(st.session_state.tag_object_type_filter),
-            key="tag_object_type_input"
-        )
-    with col2:
-        search_input = st.text_input("Search by object name", placeholder="Type object name...", key="tag_search_input", label_visibility="collapsed")
-    with col3:
-        if st.button("Search", key="tag_search_btn", type="primary", use_container_width=True):
-            st.session_state.tag_search_term = search_input
-            st.session_state.tag_object_type_filter = object_type_input
-            st.session_state.tag_current_page = 0  # Reset to first page on new search
+    # Object type selection and search; inside a form so typing does not rerun the tab
+    with st.form("tag_search_form", clear_on_submit=False, border=False):
+        col1, col2, col3 = st.columns([1, 3, 1])
+        with col1:
+            object_type_input = st.selectbox(
+                "Select Object Type",
+                OBJECT_TYPES,
+                index=OBJECT_TYPES.index(object_type_filter),
+                key="tag_object_type_input"
+            )
+        with col2:
+            search_input = st.text_input("Search by object name", placeholder="Type object name...", key="tag_search_input", label_visibility="collapsed")
+        with col3:
+            submitted = st.form_submit_button("Search", type="primary", use_container_width=True)
+    
+    if submitted:
+        st.session_state.tag_search_term = search_input
+        st.session_state.tag_object_type_filter = object_type_input
+        st.session_state.tag_current_page = 0  # Reset to first page on new search
+        object_type_filter = object_type_input
     
     # Get tag rules for selected object type
-    object_tag_rules = tag_rules_df[tag_rules_df['OBJECT_TYPE'] == st.session_state.tag_object_type_filter]
+    object_tag_rules = tag_rules_df[tag_rules_df['OBJECT_TYPE'] == object_type_filter]
     
     if object_tag_rules.empty:
-        st.info(f"No tag rules have been applied for {st.session_state.tag_object_type_filter}s yet.")
+        st.info(f"No tag rules have been applied for {object_type_filter}s yet.")
         return
     
+    _render_tag_results(session, object_tag_rules)
+
+
+def _tag_violation_html(violation, is_whitelisted):
+    """Build the HTML for one missing-tag violation item
+    
+    Args:
+        violation: Violation dict with tag_name and rule_description
+        is_whitelisted: Whether to show the Whitelisted badge
+    
+    Returns:
+        str: Violation item HTML
+    """
+    whitelisted_badge = '<span class="whitelisted-badge">Whitelisted</span>' if is_whitelisted else ''
+    return f"""
+        <div class="violation-item">
+            <div>
+                <div class="violation-rule-name">Missing Tag {whitelisted_badge}</div>
+                <div class="violation-details">
+                    <div class="violation-value">
+                        <span class="violation-label">Tag:</span>
+                        <span class="violation-code">{violation['tag_name']}</span>
+                    </div>
+                    <div class="violation-value">
+                        <span class="violation-label">-</span>
+                        <span style="color: #757575; font-size: 0.85rem;">{violation['rule_description']}</span>
+                    </div>
+                </div>
+            </div>
+        </div>
+    """
+
+
+@st.dialog("SQL Statement", width="large")
+def _show_tag_sql_dialog(object_name, object_type, violations):
+    """Show the fix SQL for an object's missing tags in a modal
+    
+    Opened straight from the Show SQL button, so no per-object open/close state is kept.
+    
+    Args:
+        object_name: Fully qualified object name
+        object_type: 'WAREHOUSE', 'DATABASE' or 'TABLE'
+        violations: The object's tag violations
+    """
+    st.markdown(f"**{object_name}**")
+    # Generate SQL for each missing tag, shown as one code block
+    combined_sql = "\n\n".join(
+        generate_tag_fix_sql(object_name, object_type, violation['tag_name'])
+        for violation in violations
+    )
+    st.code(combined_sql, language="sql")
+
+
+@st.fragment
+def _render_tag_results(session, object_tag_rules):
+    """Render the paginated tag compliance results as a fragment
+    
+    Pagination changes rerun only this section, so the rules and metrics
+    queries above are not repeated; whitelisting still triggers a full app rerun.
+    
+    Args:
+        session: Snowflake session
+        object_tag_rules: Applied tag rules for the selected object type
+    """
+    # Read session state once; the locals are used throughout the render
+    object_type_filter = st.session_state.tag_object_type_filter
+    search_term = st.session_state.tag_search_term
+    view_filter = st.session_state.tag_compliance_filter
+    page_size = st.session_state.tag_page_size
+    current_page = st.session_state.tag_current_page
+    
     # Pagination controls
     st.markdown("---")
-    offset = st.session_state.tag_current_page * st.session_state.tag_page_size
+    offset = current_page * page_size
     
     # Map filter to status
     filter_to_status = {
@@ -108,73 +205,79 @@ def render_tag_compliance_tab(session):
         "Compliant Only": "compliant",
         "Non-Compliant Only": "non-compliant",
         "Whitelisted Only": "whitelisted",
-        "Non-Compliant First": "all"  # Sort handled separately
+        "Non-Compliant First": "non-compliant-first"
     }
-    status_filter = filter_to_status.get(st.session_state.tag_compliance_filter, "all")
+    status_filter = filter_to_status.get(view_filter, "all")
     
-    try:
-        compliance_data, total_count = get_tag_compliance_results_paginated(
-            session,
-            object_type=st.session_state.tag_object_type_filter,
-            search_term=st.session_state.tag_search_term if st.session_state.tag_search_term else None,
-            status_filter=status_filter,
-            limit=st.session_state.tag_page_size,
-            offset=offset
-        )
-    except Exception as e:
-        st.error(f"Error loading compliance data: {str(e)}")
-        compliance_data, total_count = [], 0
+    # Reuse the last fetched page when only UI state (e.g. Show SQL) changed
+    query_key = (object_type_filter, search_term, status_filter, page_size, offset)
+    if st.session_state.get('tag_last_query_key') == query_key and 'tag_last_page' in st.session_state:
+        compliance_data, total_count = st.session_state.tag_last_page
+    else:
+        try:
+            compliance_data, total_count = get_tag_compliance_results_paginated(
+                session,
+                object_type=object_type_filter,
+                search_term=search_term if search_term else None,
+                status_filter=status_filter,
+                limit=page_size,
+                offset=offset
+            )
+            st.session_state.tag_last_query_key = query_key
+            st.session_state.tag_last_page = (compliance_data, total_count)
+        except Exception as e:
+            st.error(f"Error loading compliance data: {str(e)}")
+            compliance_data, total_count = [], 0
     
     # Render pagination controls
     new_page_size, new_page = render_pagination_controls(
         total_count,
-        st.session_state.tag_page_size,
-        st.session_state.tag_current_page,
+        page_size,
+        current_page,
         "tag_compliance"
     )
     
     # Update session state if pagination changed
-    if new_page_size != st.session_state.tag_page_size or new_page != st.session_state.tag_current_page:
+    if new_page_size != page_size or new_page != current_page:
         st.session_state.tag_page_size = new_page_size
         st.session_state.tag_current_page = new_page
-        st.rerun()
+        st.rerun(scope="fragment")
     
     st.markdown("---")
     
-    # Sort if "Non-Compliant First" is selected (filtering already done at DB level)
-    view_filter = st.session_state.tag_compliance_filter
+    # Filtering and "Non-Compliant First" ordering are both done at DB level
     filtered_data = compliance_data
     
-    if view_filter == "Non-Compliant First":
-        filtered_data = sorted(filtered_data, key=lambda x: (len([v for v in x['violations'] if not v.get('is_whitelisted', False)]) == 0, x['object_name']))
-    
     # Display results
     if not filtered_data:
         st.info("No objects match the selected filters.")
         return
     
-    st.markdown(f"#### Showing {len(filtered_data)} {st.session_state.tag_object_type_filter}s")
+    st.markdown(f"#### Showing {len(filtered_data)} {object_type_filter}s")
     
     # Determine color scheme based on object type
-    if st.session_state.tag_object_type_filter == "WAREHOUSE":
+    if object_type_filter == "WAREHOUSE":
         card_theme = "warehouse"
-    elif st.session_state.tag_object_type_filter == "DATABASE":
+    elif object_type_filter == "DATABASE":
         card_theme = "database"
     else:  # TABLE
         card_theme = "tag"
     
+    # For tag compliance, all tag rules for this object type apply to all objects
+    applicable_rules_count = len(object_tag_rules)
+    
     # Display objects
     for obj_comp in filtered_data:
         # Separate whitelisted and non-whitelisted violations
-        all_violations = obj_comp['violations']
-        whitelisted_violations = [v for v in all_violations if v.get('is_whitelisted', False)]
-        non_whitelisted_violations = [v for v in all_violations if not v.get('is_whitelisted', False)]
+        whitelisted_violations, non_whitelisted_violations = split_violations(obj_comp['violations'])
         
         # Determine if compliant (based on non-whitelisted violations)
         is_compliant = not non_whitelisted_violations
         
         object_name = obj_comp['object_name']
         object_type = obj_comp['object_type']
+        # Unique key for this object's buttons
+        obj_key = object_name.replace('.', '_').replace(' ', '_')
         
         # Determine which violations to show based on filter
         if view_filter == "Whitelisted Only":
@@ -182,21 +285,17 @@ def render_tag_compliance_tab(session):
         else:
             violations_to_show = non_whitelisted_violations
         
-        # Build object details
-        object_details_parts = [f"<strong>Type:</strong> {object_type}"]
-        if obj_comp.get('table_type'):
-            object_details_parts[0] = f"<strong>Type:</strong> {obj_comp['table_type']}"
-        if obj_comp.get('owner'):
-            object_details_parts.append(f"<strong>Owner:</strong> {obj_comp['owner']}")
+        # Build object details (every key is always set by get_tag_compliance_results_paginated)
+        owner = obj_comp['owner']
+        object_details_parts = [f"<strong>Type:</strong> {obj_comp['table_type'] or object_type}"]
+        if owner:
+            object_details_parts.append(f"<strong>Owner:</strong> {owner}")
         
         object_details = " | ".join(object_details_parts)
         
         # Count violations and compliant rules
         violation_count = len(non_whitelisted_violations)
         whitelisted_count_obj = len(whitelisted_violations)
-        
-        # For tag compliance, all tag rules for this object type apply to all objects
-        applicable_rules_count = len(object_tag_rules)
         compliant_rules_count = applicable_rules_count - (violation_count + whitelisted_count_obj)
         
         # Build counts display
@@ -213,73 +312,53 @@ def render_tag_compliance_tab(session):
         # Display object card
         card_class = f"{card_theme}-compact compliant" if is_compliant else f"{card_theme}-compact non-compliant"
         
+        # Assigned tags
+        if obj_comp['assigned_tags']:
+            tags_html = " ".join([f'<span class="tag-badge">{tag}</span>' for tag in obj_comp['assigned_tags']])
+            tags_block = f"<strong>Assigned Tags:</strong> {tags_html}"
+        else:
+            tags_block = "<em>No tags assigned</em>"
+        
         with st.container():
+            # Card, tags and (when no violations follow) the spacer in a single element
             st.html(f"""
                 <div class="{card_class}">
                     <div class="warehouse-name">{object_name}</div>
                     <div class="warehouse-info">{object_details}</div>
                     <div class="counts-container" style="margin-top: 6px;">{counts_html}</div>
                 </div>
+                <div class="tag-container">
+                    {tags_block}
+                </div>
+                {"" if violations_to_show else "<br>"}
             """)
             
-            # Show assigned tags
-            if obj_comp['assigned_tags']:
-                tags_html = " ".join([f'<span class="tag-badge">{tag}</span>' for tag in obj_comp['assigned_tags']])
-                st.html(f"""
-                    <div class="tag-container">
-                        <strong>Assigned Tags:</strong> {tags_html}
-                    </div>
-                """)
-            else:
-                st.html(f"""
-                    <div class="tag-container">
-                        <em>No tags assigned</em>
-                    </div>
-                """)
-            
             # Show violations if any
             if violations_to_show:
                 # Show violations in compact format
                 col1, col2 = st.columns([3, 1])
                 
                 with col1:
-                    for idx, violation in enumerate(violations_to_show):
-                        is_whitelisted = violation.get('is_whitelisted', False)
-                        
-                        # Create columns for violation and whitelist button
-                        vcol1, vcol2 = st.columns([5, 1])
-                        
-                        with vcol1:
-                            whitelisted_badge = '<span class="whitelisted-badge">Whitelisted</span>' if is_whitelisted else ''
-                            st.html(f"""
-                                <div class="violation-item">
-                                    <div>
-                                        <div class="violation-rule-name">Missing Tag {whitelisted_badge}</div>
-                                        <div class="violation-details">
-                                            <div class="violation-value">
-                                                <span class="violation-label">Tag:</span>
-                                                <span class="violation-code">{violation['tag_name']}</span>
-                                            </div>
-                                            <div class="violation-value">
-                                                <span class="violation-label">-</span>
-                                                <span style="color: #757575; font-size: 0.85rem;">{violation['rule_description']}</span>
-                                            </div>
-                                        </div>
-                                    </div>
-                                </div>
-                            """)
-                        
-                        with vcol2:
-                            # Add whitelist button only for non-whitelisted violations
-                            if not is_whitelisted:
+                    if view_filter == "Whitelisted Only":
+                        # Nothing to whitelist: emit every item as one element, no per-violation columns
+                        st.html("".join([_tag_violation_html(violation, True) for violation in violations_to_show]))
+                    else:
+                        for idx, violation in enumerate(violations_to_show):
+                            # Create columns for violation and whitelist button
+                            vcol1, vcol2 = st.columns([5, 1])
+                            
+                            with vcol1:
+                                st.html(_tag_violation_html(violation, False))
+                            
+                            with vcol2:
                                 st.html('<div class="whitelist-button-wrapper">')
-                                if st.button("Whitelist", key=f"whitelist_tag_{object_name.replace('.', '_')}_{idx}", 
+                                if st.button("Whitelist", key=f"whitelist_tag_{obj_key}_{idx}", 
                                            help="Whitelist this violation",
                                            type="secondary"):
                                     try:
                                         # Extract database, schema, table names from obj_comp
-                                        db_name = obj_comp.get('object_database')
-                                        schema_name = obj_comp.get('object_schema')
+                                        db_name = obj_comp['object_database']
+                                        schema_name = obj_comp['object_schema']
                                         table_name = None
                                         
                                         # For tables, extract table name from object_name
@@ -301,34 +380,15 @@ def render_tag_compliance_tab(session):
                                             reason=f"Whitelisted from UI"
                                         )
                                         st.success(f"Violation whitelisted for {object_name}")
+                                        clear_whitelist_caches()
                                         st.rerun()
                                     except Exception as e:
                                         st.error(f"Error whitelisting: {str(e)}")
                                 st.html('</div>')
                 
                 with col2:
-                    # Create unique key for buttons
-                    obj_key = object_name.replace('.', '_').replace(' ', '_')
-                    
                     # Only show SQL button (no fix button for tags)
                     if st.button("Show SQL", key=f"sql_{obj_key}", use_container_width=True):
-                        st.session_state[f'show_sql_{obj_key}'] = True
+                        _show_tag_sql_dialog(object_name, object_type, obj_comp['violations'])
                 
-                # Show SQL if button was clicked
-                if st.session_state.get(f'show_sql_{obj_key}', False):
-                    with st.expander("SQL Statement", expanded=True):
-                        # Generate SQL for each missing tag
-                        for violation in obj_comp['violations']:
-                            fix_sql = generate_tag_fix_sql(
-                                object_name,
-                                object_type,
-                                violation['tag_name']
-                            )
-                            st.code(fix_sql, language="sql")
-                        
-                        # Add close button
-                        if st.button("Close", key=f"close_sql_{obj_key}"):
-                            st.session_state[f'show_sql_{obj_key}'] = False
-                            st.rerun()
-            
-            st.html("<br>")
+                st.html("<br>")
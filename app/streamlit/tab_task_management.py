@@ -53,7 +53,7 @@ def render_task_management_tab(session):
             """)
             
             # Display each task in table rows
-            for idx, task in tasks_df.iterrows():
+            for idx, task in enumerate(tasks_df.to_dict('records')):
                 # Handle both uppercase and lowercase column names
                 task_name = task.get('"name"', '')
                 task_state = task.get('"state"', '')
@@ -129,18 +129,18 @@ def render_task_management_tab(session):
                 history_df = get_task_history(session, task_name)
                 
                 if not history_df.empty:
-                    for hist_idx, run in history_df.iterrows():
-                        state_color = "green" if run['STATE'] == 'SUCCEEDED' else ("orange" if run['STATE'] == 'SCHEDULED' else "red")
+                    for run in history_df.itertuples(index=False):
+                        state_color = "green" if run.STATE == 'SUCCEEDED' else ("orange" if run.STATE == 'SCHEDULED' else "red")
                         error_info = ""
-                        if run['STATE'] == 'FAILED' and run['ERROR_MESSAGE']:
-                            error_info = f"<br><strong>Error:</strong> {run['ERROR_MESSAGE']}"
+                        if run.STATE == 'FAILED' and run.ERROR_MESSAGE:
+                            error_info = f"<br><strong>Error:</strong> {run.ERROR_MESSAGE}"
                         
                         st.html(f"""
                             <div style="padding: 10px; margin: 5px 0; background-color: #f8f9fa; border-left: 3px solid {state_color};">
-                                <strong>Status:</strong> <span style="color: {state_color};">{run['STATE']}</span><br>
-                                <strong>Scheduled:</strong> {run['SCHEDULED_TIME']}<br>
-                                <strong>Completed:</strong> {run['COMPLETED_TIME'] if run['COMPLETED_TIME'] else 'N/A'}<br>
-                                <strong>Duration:</strong> {run['DURATION_SECONDS'] if run['DURATION_SECONDS'] else 'N/A'} seconds
+                                <strong>Status:</strong> <span style="color: {state_color};">{run.STATE}</span><br>
+                                <strong>Scheduled:</strong> {run.SCHEDULED_TIME}<br>
+                                <strong>Completed:</strong> {run.COMPLETED_TIME if run.COMPLETED_TIME else 'N/A'}<br>
+                                <strong>Duration:</strong> {run.DURATION_SECONDS if run.DURATION_SECONDS else 'N/A'} seconds
                                 {error_info}
                             </div>
                         """)
@@ -5,11 +5,11 @@ Displays warehouse compliance status against applied rules
 
 import streamlit as st
 import pandas as pd
-from database import (get_applied_rules, get_warehouse_details, execute_sql, get_wh_statement_timeout_default, 
-                      get_tag_compliance_details, get_whitelisted_violations, add_to_whitelist, 
+from database import (get_applied_rules_cached, get_connection_key, get_warehouse_details, execute_sql, get_wh_statement_timeout_default, 
+                      get_tag_compliance_details, clear_whitelist_caches, add_to_whitelist, 
                       get_wh_compliance_results_paginated, get_wh_compliance_metrics)
 from compliance import generate_wh_fix_sql, generate_wh_post_fix_update_sql
-from ui_utils import render_refresh_button, render_section_header, render_filter_button, filter_by_search, render_pagination_controls
+from ui_utils import render_refresh_button, render_section_header, render_filter_button, filter_by_search, render_pagination_controls, split_violations
 
 
 def render_wh_compliance_view_tab(session):
@@ -39,7 +39,7 @@ def render_wh_compliance_view_tab(session):
             st.rerun()
     st.markdown("---")
     
-    applied_rules_df = get_applied_rules(session)
+    applied_rules_df = get_applied_rules_cached(session, get_connection_key(session))
     
     if applied_rules_df.empty:
         st.info("No rules applied yet. Go to 'Rule Configuration' tab to apply rules.")
@@ -134,13 +134,15 @@ def _render_tile_view(session, compliance_data, view_filter):
     """Render tile view of warehouse compliance"""
     # Sort data if "Non-Compliant First" is selected
     if view_filter == "Non-Compliant First":
-        compliance_data = sorted(compliance_data, key=lambda x: (len([v for v in x['violations'] if not v.get('is_whitelisted', False)]) == 0, x['warehouse_name']))
+        compliance_data = sorted(compliance_data, key=lambda x: (
+            all(v.get('is_whitelisted', False) for v in x['violations']), x['warehouse_name']))
+    
+    # Warehouses whose SQL panel is open, one set instead of a session key per warehouse
+    open_sql = st.session_state.setdefault('wh_open_sql', set())
     
     for wh_comp in compliance_data:
         # Separate whitelisted and non-whitelisted violations
-        all_violations = wh_comp['violations']
-        whitelisted_violations = [v for v in all_violations if v.get('is_whitelisted', False)]
-        non_whitelisted_violations = [v for v in all_violations if not v.get('is_whitelisted', False)]
+        whitelisted_violations, non_whitelisted_violations = split_violations(wh_comp['violations'])
         
         has_violations = len(non_whitelisted_violations) > 0
         warehouse_name = wh_comp['warehouse_name']
@@ -151,7 +153,7 @@ def _render_tile_view(session, compliance_data, view_filter):
         if warehouse_name in st.session_state.fixed_warehouses:
             fix_status = st.session_state.fixed_warehouses[warehouse_name]
             
-            # Display success or error card
+            # Display success or error card, with the spacer in the same element
             if fix_status['success']:
                 st.html(f"""
                     <div class="warehouse-compact compliant">
@@ -160,6 +162,7 @@ def _render_tile_view(session, compliance_data, view_filter):
                             ✔ Configuration Updated
                         </div>
                     </div>
+                    <br>
                 """)
             else:
                 st.html(f"""
@@ -169,9 +172,8 @@ def _render_tile_view(session, compliance_data, view_filter):
                             ✖ Fix Failed: {fix_status['error']}
                         </div>
                     </div>
+                    <br>
                 """)
-            
-            st.html("<br>")
             continue
         
         # Determine which violations to show based on filter
@@ -271,6 +273,7 @@ def _render_tile_view(session, compliance_data, view_filter):
                                             reason=f"Whitelisted from UI"
                                         )
                                         st.success(f"Violation whitelisted for {warehouse_name}")
+                                        clear_whitelist_caches()
                                         st.rerun()
                                     except Exception as e:
                                         st.error(f"Error whitelisting: {str(e)}")
@@ -319,10 +322,10 @@ def _render_tile_view(session, compliance_data, view_filter):
                         
                         if has_any_fix_sql:
                             if st.button("Show SQL", key=f"btn_show_sql_{warehouse_name}", use_container_width=True):
-                                st.session_state[f'show_sql_{warehouse_name}'] = True
+                                open_sql.add(warehouse_name)
                         
                         # Display SQL if requested
-                        if st.session_state.get(f'show_sql_{warehouse_name}', False):
+                        if warehouse_name in open_sql:
                             sql_statements = []
                             for violation in wh_comp['violations']:
                                 if violation.get('has_fix_sql', False):
@@ -338,10 +341,10 @@ def _render_tile_view(session, compliance_data, view_filter):
                                 st.code(combined_sql, language="sql")
                                 
                                 if st.button("Hide SQL", key=f"btn_hide_sql_{warehouse_name}"):
-                                    st.session_state[f'show_sql_{warehouse_name}'] = False
+                                    open_sql.discard(warehouse_name)
                                     st.rerun()
             
-            # Show compliant rules if there are any
+            # Show compliant rules if there are any, and the card spacer, as one element
             if wh_comp.get('compliant_rules'):
                 compliant_rules = wh_comp['compliant_rules']
                 rule_badges = ''.join([
@@ -355,6 +358,7 @@ def _render_tile_view(session, compliance_data, view_filter):
                             {rule_badges}
                         </div>
                     </div>
+                    <br>
                 """)
-            
-            st.html("<br>")
+            else:
+                st.html("<br>")
@@ -5,24 +5,36 @@ Displays all whitelisted violations and allows bulk management
 
 import streamlit as st
 import pandas as pd
-from database import get_whitelisted_violations, bulk_remove_from_whitelist
-from ui_utils import render_refresh_button, render_section_header
+from database import get_whitelisted_violations_cached, get_connection_key, bulk_remove_from_whitelist, clear_whitelist_caches
+from ui_utils import render_refresh_button, render_section_header, render_pagination_controls
+
+
+def _reset_whitelist_page():
+    """Filter callback: start a changed filter on its first page"""
+    st.session_state.whitelist_current_page = 0
 
 
 def render_whitelist_tab(session):
     """Render the Whitelist Management tab"""
+    # Initialize pagination state
+    if 'whitelist_page_size' not in st.session_state:
+        st.session_state.whitelist_page_size = 25
+    if 'whitelist_current_page' not in st.session_state:
+        st.session_state.whitelist_current_page = 0
+    
     # Refresh button in top right
     col_title, col_refresh = render_refresh_button("tab_whitelist")
     with col_title:
         render_section_header("Whitelist Management", "settings-icon")
     with col_refresh:
         if st.button("↻", key="refresh_tab_whitelist", help="Refresh data", type="secondary"):
+            get_whitelisted_violations_cached.clear()
             st.rerun()
     st.markdown("---")
     
     # Get all whitelisted violations
     try:
-        whitelist_df = get_whitelisted_violations(session)
+        whitelist_df = get_whitelisted_violations_cached(session, get_connection_key(session))
     except Exception as e:
         st.error(f"Error loading whitelists: {str(e)}")
         return
@@ -60,7 +72,8 @@ def render_whitelist_tab(session):
         filter_type = st.selectbox(
             "Filter by Object Type",
             ["All"] + sorted(whitelist_df['OBJECT_TYPE'].unique().tolist()),
-            key="whitelist_type_filter"
+            key="whitelist_type_filter",
+            on_change=_reset_whitelist_page
         )
     
     with col2:
@@ -69,29 +82,31 @@ def render_whitelist_tab(session):
         filter_rule = st.selectbox(
             "Filter by Rule",
             ["All"] + sorted(rule_names),
-            key="whitelist_rule_filter"
+            key="whitelist_rule_filter",
+            on_change=_reset_whitelist_page
         )
     
     with col3:
         search_term = st.text_input(
             "Search object name",
             placeholder="Type to search...",
-            key="whitelist_search"
+            key="whitelist_search",
+            on_change=_reset_whitelist_page
         )
     
-    # Apply filters
-    filtered_df = whitelist_df.copy()
+    # Apply filters as one combined mask (no intermediate copies of the frame)
+    mask = pd.Series(True, index=whitelist_df.index)
     
     if filter_type != "All":
-        filtered_df = filtered_df[filtered_df['OBJECT_TYPE'] == filter_type]
+        mask &= whitelist_df['OBJECT_TYPE'] == filter_type
     
     if filter_rule != "All":
-        filtered_df = filtered_df[filtered_df['RULE_NAME'] == filter_rule]
+        mask &= whitelist_df['RULE_NAME'] == filter_rule
     
     if search_term:
-        filtered_df = filtered_df[
-            filtered_df['OBJECT_NAME'].str.contains(search_term, case=False, na=False)
-        ]
+        mask &= whitelist_df['OBJECT_NAME'].str.contains(search_term, case=False, na=False, regex=False)
+    
+    filtered_df = whitelist_df[mask]
     
     st.markdown(f"**Showing {len(filtered_df)} of {total_whitelists} whitelisted violations**")
     st.markdown("---")
@@ -123,8 +138,25 @@ def render_whitelist_tab(session):
     
     st.markdown("---")
     
+    # Only the current page of cards is rendered; selections on other pages are kept
+    new_page_size, new_page = render_pagination_controls(
+        len(filtered_df),
+        st.session_state.whitelist_page_size,
+        st.session_state.whitelist_current_page,
+        "whitelist_cards"
+    )
+    
+    # Update session state if pagination changed
+    if new_page_size != st.session_state.whitelist_page_size or new_page != st.session_state.whitelist_current_page:
+        st.session_state.whitelist_page_size = new_page_size
+        st.session_state.whitelist_current_page = new_page
+        st.rerun()
+    
+    offset = st.session_state.whitelist_current_page * st.session_state.whitelist_page_size
+    page_df = filtered_df.iloc[offset:offset + st.session_state.whitelist_page_size]
+    
     # Display whitelisted violations with checkboxes
-    for _, row in filtered_df.iterrows():
+    for row in page_df.to_dict('records'):
         whitelist_id = row['WHITELIST_ID']
         
         # Determine card color based on object type
@@ -204,6 +236,7 @@ def render_whitelist_tab(session):
             if st.button("Remove Selected from Whitelist", type="primary", use_container_width=True, key="remove_selected_btn"):
                 try:
                     bulk_remove_from_whitelist(session, st.session_state.selected_whitelists)
+                    clear_whitelist_caches()
                     st.success(f"Successfully removed {len(st.session_state.selected_whitelists)} violation(s) from whitelist!")
                     st.session_state.selected_whitelists = []
                     st.rerun()
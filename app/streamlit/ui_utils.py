@@ -3,11 +3,20 @@ UI utilities module
 Common UI components and helper functions
 """
 
+import io
+import pandas as pd
 import streamlit as st
 from pathlib import Path
 from datetime import datetime
 
 
+# Rows rendered in st.dataframe for custom query results
+MAX_DISPLAY_ROWS = 5000
+
+# Rows included in the "full" CSV download of a capped query
+MAX_EXPORT_ROWS = 1000000
+
+
 def load_css():
     """Load custom CSS from external file"""
     css_file = Path(__file__).parent / "styles.css"
@@ -57,9 +66,17 @@ def render_metric_card(value, label, card_type=""):
     """)
 
 
+def _set_filter(session_state_key, filter_value):
+    """Button callback: store the selected filter before the click's rerun starts"""
+    st.session_state[session_state_key] = filter_value
+
+
 def render_filter_button(label, value, filter_key, filter_value, session_state_key):
     """Render a filter button with primary/secondary type based on active state
     
+    The filter is set in an on_click callback, so every button in the row already
+    renders with the new highlight on the click's own rerun; no second st.rerun() is needed.
+    
     Args:
         label: Button label text
         value: Value to display (e.g., count, percentage)
@@ -72,16 +89,14 @@ def render_filter_button(label, value, filter_key, filter_value, session_state_k
     """
     is_active = st.session_state.get(session_state_key) == filter_value
     btn_type = "primary" if is_active else "secondary"
-    clicked = st.button(
+    return st.button(
         f"**{value}**\n\n{label}", 
         key=filter_key, 
         use_container_width=True, 
-        type=btn_type
+        type=btn_type,
+        on_click=_set_filter,
+        args=(session_state_key, filter_value)
     )
-    if clicked:
-        st.session_state[session_state_key] = filter_value
-        st.rerun()
-    return clicked
 
 
 def render_section_header(title, icon_class=""):
@@ -130,19 +145,66 @@ def execute_query_with_error_handling(session, query, error_message="Error execu
         return None
 
 
-def render_count_metric(session, query, label):
-    """Render a metric showing count from a query
+def fetch_limited(session, query, max_rows):
+    """Run a query as written and read at most max_rows rows of its result
+    
+    The SQL is not rewritten, so ORDER BY and multi-part statements keep their meaning;
+    result batches stop being fetched once the limit is passed.
     
     Args:
         session: Snowflake session
-        query: SQL query that returns a COUNT
-        label: Metric label
+        query: SQL query entered by the user
+        max_rows: Maximum number of rows to return
+        
+    Returns:
+        tuple: (DataFrame, was_limited)
     """
-    try:
-        count = session.sql(query).collect()[0]['CNT']
-        st.metric(label, count)
-    except:
-        st.metric(label, "Error")
+    batches, row_count = [], 0
+    for batch_df in session.sql(query).to_pandas_batches():
+        batches.append(batch_df)
+        row_count += len(batch_df)
+        if row_count > max_rows:
+            break
+    if not batches:
+        return pd.DataFrame(), False
+    result_df = pd.concat(batches, ignore_index=True)
+    return result_df.head(max_rows), row_count > max_rows
+
+
+def query_to_csv_bytes(session, query, max_rows):
+    """Stream up to max_rows rows of a query's result into CSV bytes batch by batch
+    
+    Args:
+        session: Snowflake session
+        query: SQL query string
+        max_rows: Maximum number of rows to write
+        
+    Returns:
+        CSV content as bytes
+    """
+    buffer = io.BytesIO()
+    remaining = max_rows
+    for batch_idx, batch_df in enumerate(session.sql(query).to_pandas_batches()):
+        batch_df.head(remaining).to_csv(buffer, index=False, header=(batch_idx == 0), encoding='utf-8')
+        remaining -= len(batch_df)
+        if remaining <= 0:
+            break
+    return buffer.getvalue()
+
+
+def split_violations(violations):
+    """Split violations by whitelist status
+    
+    Args:
+        violations: List of violation dictionaries with an optional is_whitelisted flag
+    
+    Returns:
+        tuple: (whitelisted_violations, non_whitelisted_violations)
+    """
+    whitelisted, non_whitelisted = [], []
+    for violation in violations:
+        (whitelisted if violation.get('is_whitelisted', False) else non_whitelisted).append(violation)
+    return whitelisted, non_whitelisted
 
 
 def filter_by_search(items, search_term, *search_fields):
@@ -182,27 +244,30 @@ def filter_by_search(items, search_term, *search_fields):
     return filtered
 
 
-def render_rule_card(rule, rule_type_class, rule_type_icon, violation_count=None):
+def _violation_count_html(violation_count):
+    """Build the violation count badge for a rule card; empty when no count is given"""
+    if violation_count is None:
+        return ""
+    if violation_count > 0:
+        return f'<span class="violation-count"><span class="warning-icon"></span> {violation_count} violation{"s" if violation_count != 1 else ""}</span>'
+    return '<span class="compliant-count"><span class="check-icon"></span> All compliant</span>'
+
+
+def render_rule_card(rule, rule_type_class, rule_type_icon, violation_count=None, leading_divider=False):
     """Render an applied rule card with consistent styling
     
     Args:
-        rule: Rule dictionary with RULE_NAME, THRESHOLD_VALUE, SCOPE, TAG_NAME, TAG_VALUE, etc.
+        rule: Applied rule row from itertuples() of get_applied_rules_cached() with RULE_NAME, THRESHOLD_INT,
+              APPLIED_AT_STR, SCOPE, TAG_NAME, TAG_VALUE, etc.
         rule_type_class: CSS class ('warehouse' or 'database')
         rule_type_icon: HTML for icon
         violation_count: Optional number of violations for this rule
+        leading_divider: Prepend a horizontal rule in the same element, saving a separate st.markdown("---")
     """
-    # Build violation count display if provided
-    violation_html = ""
-    if violation_count is not None:
-        if violation_count > 0:
-            violation_html = f'<span class="violation-count"><span class="warning-icon"></span> {violation_count} violation{"s" if violation_count != 1 else ""}</span>'
-        else:
-            violation_html = '<span class="compliant-count"><span class="check-icon"></span> All compliant</span>'
-    
     # Build scope display
-    scope = rule.get('SCOPE', 'ALL')
-    tag_name = rule.get('TAG_NAME')
-    tag_value = rule.get('TAG_VALUE')
+    scope = getattr(rule, 'SCOPE', 'ALL')
+    tag_name = getattr(rule, 'TAG_NAME', None)
+    tag_value = getattr(rule, 'TAG_VALUE', None)
     
     if scope == 'TAG_BASED' and tag_name:
         if tag_value:
@@ -212,15 +277,44 @@ def render_rule_card(rule, rule_type_class, rule_type_icon, violation_count=None
     else:
         scope_html = '<span class="rule-scope-label all-objects">All Objects</span>'
     
+    divider = "<hr>" if leading_divider else ""
     st.html(f"""
+        {divider}
         <div class="rule-card {rule_type_class}">
             <h4 style="margin-top:0;">
-                {rule_type_icon} {rule['RULE_NAME']}
-                <span class="rule-type-label {rule_type_class}">{rule['RULE_TYPE']}</span>
+                {rule_type_icon} {rule.RULE_NAME}
+                <span class="rule-type-label {rule_type_class}">{rule.RULE_TYPE}</span>
                 {scope_html}
-                {violation_html}
+                {_violation_count_html(violation_count)}
             </h4>
-            <p style="margin-bottom:0.5rem;"><strong>Threshold:</strong> {int(rule['THRESHOLD_VALUE'])} {rule['UNIT']} | <strong>Applied:</strong> {rule['APPLIED_AT'].strftime('%Y-%m-%d %H:%M')}</p>
+            <p style="margin-bottom:0.5rem;"><strong>Threshold:</strong> {rule.THRESHOLD_INT} {rule.UNIT} | <strong>Applied:</strong> {rule.APPLIED_AT_STR}</p>
+        </div>
+    """)
+
+
+def render_tag_rule_card(tag_rule, violation_count, leading_divider=False):
+    """Render an applied tag rule card with consistent styling
+    
+    Args:
+        tag_rule: Applied tag rule row from itertuples() of get_applied_tag_rules_cached() with TAG_NAME,
+                  OBJECT_TYPE, APPLIED_AT_STR, APPLIED_BY
+        violation_count: Number of violations for this tag rule
+        leading_divider: Prepend a horizontal rule in the same element, saving a separate st.markdown("---")
+    """
+    divider = "<hr>" if leading_divider else ""
+    st.html(f"""
+        {divider}
+        <div class="rule-card tag">
+            <h4 style="margin-top:0;">
+                <span class="tag-icon"></span> Tag: {tag_rule.TAG_NAME}
+                <span class="rule-type-label tag">TAG RULE</span>
+                {_violation_count_html(violation_count)}
+            </h4>
+            <p style="margin-bottom:0.5rem;">
+                <strong>Object Type:</strong> {tag_rule.OBJECT_TYPE} | 
+                <strong>Applied:</strong> {tag_rule.APPLIED_AT_STR} | 
+                <strong>Applied By:</strong> {getattr(tag_rule, 'APPLIED_BY', 'N/A')}
+            </p>
         </div>
     """)
 
@@ -284,3 +378,144 @@ def render_pagination_controls(total_count, page_size, current_page, key_prefix)
     return page_size, current_page
 
 
+def render_query_block(session, key_prefix):
+    """Render the custom SQL query editor with results, CSV download and example queries
+    
+    Args:
+        session: Snowflake session
+        key_prefix: Unique prefix for widget and session state keys
+    """
+    result_key = f"{key_prefix}_query_result"
+    csv_key = f"{key_prefix}_query_result_csv"
+    error_key = f"{key_prefix}_query_error"
+    full_sql_key = f"{key_prefix}_query_full_sql"
+    row_limit_key = f"{key_prefix}_query_row_limit"
+    
+    st.markdown("""
+    Execute custom SQL queries against your Snowflake account. 
+    View results in a table format or see error messages if the query fails.
+    """)
+    
+    # Initialize session state for query results
+    for state_key in (result_key, csv_key, error_key, full_sql_key, row_limit_key):
+        if state_key not in st.session_state:
+            st.session_state[state_key] = None
+    
+    # SQL Query input
+    query = st.text_area(
+        "Enter your SQL query:",
+        placeholder="SELECT * FROM INFORMATION_SCHEMA.DATABASES LIMIT 10;",
+        height=150,
+        key=f"{key_prefix}_sql_query_input"
+    )
+    
+    # Execute button
+    col1, col2, col3, col4 = st.columns([1, 1, 1, 3])
+    with col3:
+        max_rows = st.number_input("Max rows", min_value=1, max_value=MAX_EXPORT_ROWS, value=10000, step=1000,
+                                   key=f"{key_prefix}_query_max_rows", label_visibility="collapsed",
+                                   help="Results are capped at this many rows")
+    with col1:
+        if st.button("Execute Query", key=f"{key_prefix}_execute_query_btn", type="primary"):
+            if query.strip():
+                try:
+                    # Execute the query as written, reading at most max_rows rows
+                    result_df, was_limited = fetch_limited(session, query, int(max_rows))
+                    st.session_state[full_sql_key] = query if was_limited else None
+                    st.session_state[row_limit_key] = int(max_rows) if was_limited else None
+                    st.session_state[result_key] = result_df
+                    st.session_state[csv_key] = st.session_state[result_key].to_csv(index=False).encode('utf-8')
+                    st.session_state[error_key] = None
+                except Exception as e:
+                    st.session_state[error_key] = str(e)
+                    st.session_state[result_key] = None
+            else:
+                st.session_state[error_key] = "Please enter a query to execute."
+                st.session_state[result_key] = None
+    
+    with col2:
+        if st.button("Clear Results", key=f"{key_prefix}_clear_results_btn", type="secondary"):
+            # Results render below this point, so no extra rerun is needed
+            for state_key in (result_key, csv_key, error_key, full_sql_key, row_limit_key):
+                st.session_state[state_key] = None
+    
+    st.markdown("---")
+    
+    # Display results or errors
+    if st.session_state[error_key]:
+        st.error(f"**Query Error:**\n\n{st.session_state[error_key]}")
+    
+    result_df = st.session_state[result_key]
+    if result_df is not None:
+        if not result_df.empty:
+            st.success(f"Query returned {len(result_df)} rows")
+            
+            # Display dataframe with scrolling; very large results only show a head sample
+            display_df = result_df
+            if len(display_df) > MAX_DISPLAY_ROWS:
+                st.warning(f"Showing first {MAX_DISPLAY_ROWS} of {len(display_df)} rows — download for full results.")
+                display_df = display_df.head(MAX_DISPLAY_ROWS)
+            st.dataframe(
+                display_df,
+                use_container_width=True,
+                hide_index=True
+            )
+            
+            # Add download button (CSV is encoded once when the query runs)
+            st.download_button(
+                label="Download Results as CSV",
+                data=st.session_state[csv_key],
+                file_name="query_results.csv",
+                mime="text/csv",
+                key=f"{key_prefix}_download_csv_btn"
+            )
+            
+            # Offer a larger export when the query hit the limit used at execution, not the
+            # widget's current value; the CSV is built in the click's run and not kept in session state
+            row_limit = st.session_state[row_limit_key]
+            if st.session_state[full_sql_key] and row_limit:
+                st.info(f"Results were capped at {row_limit} rows.")
+                if row_limit < MAX_EXPORT_ROWS:
+                    st.caption(f"The full download is capped at {MAX_EXPORT_ROWS:,} rows.")
+                    if st.button("Prepare Full Download", key=f"{key_prefix}_prepare_full_csv_btn"):
+                        try:
+                            st.download_button(
+                                label="Download Full Results as CSV",
+                                data=query_to_csv_bytes(session, st.session_state[full_sql_key], MAX_EXPORT_ROWS),
+                                file_name="query_results_full.csv",
+                                mime="text/csv",
+                                key=f"{key_prefix}_download_full_csv_btn"
+                            )
+                        except Exception as e:
+                            st.error(f"Error preparing full download: {str(e)}")
+        else:
+            st.info("Query executed successfully but returned no results.")
+    
+    # Add helpful examples
+    with st.expander("Example Queries"):
+        st.markdown("""
+        **List all databases:**
+        ```sql
+        SHOW DATABASES;
+        ```
+        
+        **List all warehouses:**
+        ```sql
+        SHOW WAREHOUSES;
+        ```
+        
+        **View warehouse configurations:**
+        ```sql
+        SELECT * FROM DATA_SCHEMA.WAREHOUSE_DETAILS LIMIT 10;
+        ```
+        
+        **View applied rules:**
+        ```sql
+        SELECT * FROM DATA_SCHEMA.APPLIED_RULES;
+        ```
+        
+        **View database retention policies:**
+        ```sql
+        SELECT * FROM DATA_SCHEMA.DATABASE_RETENTION_DETAILS LIMIT 10;
+        ```
+        """)